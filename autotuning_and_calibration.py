@@ -269,7 +269,7 @@ class Ui_MainWindow(object):
         self.verticalLayout_4.addWidget(self.SelectImages)
         self.verticalLayout_6.addWidget(self.BatchProcessing)
         self.ParameterLock = QtWidgets.QWidget(self.Parameters)
-        self.ParameterLock.setMaximumSize(QtCore.QSize(16777215, 200))
+        self.ParameterLock.setMaximumSize(QtCore.QSize(16777215, 300))
         self.ParameterLock.setStyleSheet("border: 1px solid rgb(55, 65, 81);\n"
 "border-radius: 8px;\n"
 "background-color: #0f1b23;")
@@ -294,6 +294,65 @@ class Ui_MainWindow(object):
         self.PLExp.setObjectName("PLExp")
         self.verticalLayout_5.addWidget(self.PLExp)
         
+        self.LensModel = QtWidgets.QWidget(self.ParameterLock)
+        self.LensModel.setStyleSheet("border: None;")
+        self.LensModel.setObjectName("LensModel")
+        self.horizontalLayout_17 = QtWidgets.QHBoxLayout(self.LensModel)
+        self.horizontalLayout_17.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_17.setSpacing(6)
+        self.horizontalLayout_17.setObjectName("horizontalLayout_17")
+        self.LensModelLabel = QtWidgets.QLabel(self.LensModel)
+        self.LensModelLabel.setStyleSheet("color: #d1d5db;\n"
+"font-size: 14px;\n"
+"")
+        self.LensModelLabel.setFont(space_grotesk)
+        self.LensModelLabel.setObjectName("LensModelLabel")
+        self.horizontalLayout_17.addWidget(self.LensModelLabel)
+        self.LensModelDropDown = QtWidgets.QComboBox(self.LensModel)
+        self.LensModelDropDown.setStyleSheet("color: #e5e7eb;\n"
+"font-size: 14px;\n"
+"background-color: #1f2937;\n"
+"padding: 4px 24px 4px 8px;\n"
+"border-color: rgb(55 65 81);\n"
+"border-radius: 4px")
+        self.LensModelDropDown.setFont(space_grotesk)
+        self.LensModelDropDown.setObjectName("LensModelDropDown")
+        self.LensModelDropDown.addItem("")
+        self.LensModelDropDown.addItem("")
+        self.LensModelDropDown.addItem("")
+        self.horizontalLayout_17.addWidget(self.LensModelDropDown)
+        self.verticalLayout_5.addWidget(self.LensModel)
+        self.MultiStart = QtWidgets.QWidget(self.ParameterLock)
+        self.MultiStart.setStyleSheet("border: None;")
+        self.MultiStart.setObjectName("MultiStart")
+        self.horizontalLayout_19 = QtWidgets.QHBoxLayout(self.MultiStart)
+        self.horizontalLayout_19.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_19.setSpacing(6)
+        self.horizontalLayout_19.setObjectName("horizontalLayout_19")
+        self.MultiStartLabel = QtWidgets.QLabel(self.MultiStart)
+        self.MultiStartLabel.setStyleSheet("color: #d1d5db;\n"
+"font-size: 14px;\n"
+"")
+        self.MultiStartLabel.setFont(space_grotesk)
+        self.MultiStartLabel.setObjectName("MultiStartLabel")
+        self.horizontalLayout_19.addWidget(self.MultiStartLabel)
+        self.MultiStartSpinBox = QtWidgets.QSpinBox(self.MultiStart)
+        self.MultiStartSpinBox.setStyleSheet("QSpinBox {\n"
+"    color: #e5e7eb;\n"
+"    font-size: 14px;\n"
+"    background-color: #1f2937;\n"
+"    padding: 4px 8px;\n"
+"    border: 1px solid #374151;\n"
+"    border-radius: 4px;\n"
+"}")
+        self.MultiStartSpinBox.setFont(space_grotesk)
+        self.MultiStartSpinBox.setMinimum(1)
+        self.MultiStartSpinBox.setMaximum(64)
+        self.MultiStartSpinBox.setProperty("value", 1)
+        self.MultiStartSpinBox.setObjectName("MultiStartSpinBox")
+        self.horizontalLayout_19.addWidget(self.MultiStartSpinBox)
+        self.verticalLayout_5.addWidget(self.MultiStart)
+
         # === START STYLE MODIFICATION ===
         # Replaced simple QCheckBoxes with styled toggle widgets
         self.DistortionPL = QtWidgets.QWidget(self.ParameterLock)
@@ -724,6 +783,33 @@ class Ui_MainWindow(object):
         self.SSNumber.setObjectName("SSNumber")
         self.horizontalLayout_16.addWidget(self.SSNumber, 0, QtCore.Qt.AlignRight)
         self.verticalLayout_9.addWidget(self.SS)
+        self.Tangential = QtWidgets.QWidget(self.EstimatedParameters)
+        self.Tangential.setStyleSheet("border-left: None;\n"
+"border-right: None;\n"
+"border-top: None;\n"
+"border-radius: 0px;")
+        self.Tangential.setObjectName("Tangential")
+        self.horizontalLayout_18 = QtWidgets.QHBoxLayout(self.Tangential)
+        self.horizontalLayout_18.setContentsMargins(0, -1, 0, -1)
+        self.horizontalLayout_18.setObjectName("horizontalLayout_18")
+        self.TangentialLabel = QtWidgets.QLabel(self.Tangential)
+        self.TangentialLabel.setMaximumSize(QtCore.QSize(16777215, 30))
+        self.TangentialLabel.setStyleSheet("border: None;\n"
+"color: #9ca3af;\n"
+"font-size: 14px;\n"
+"")
+        self.TangentialLabel.setFont(space_grotesk)
+        self.TangentialLabel.setObjectName("TangentialLabel")
+        self.horizontalLayout_18.addWidget(self.TangentialLabel)
+        self.TangentialNumber = QtWidgets.QLabel(self.Tangential)
+        self.TangentialNumber.setStyleSheet("border: None;\n"
+"color: #ffffff;\n"
+"font-size: 14px;\n"
+"font-weight: 500;")
+        self.TangentialNumber.setFont(space_grotesk)
+        self.TangentialNumber.setObjectName("TangentialNumber")
+        self.horizontalLayout_18.addWidget(self.TangentialNumber, 0, QtCore.Qt.AlignRight)
+        self.verticalLayout_9.addWidget(self.Tangential)
         self.ApplyParameters = QtWidgets.QPushButton(self.EstimatedParameters)
         self.ApplyParameters.setStyleSheet("border: None;\n"
 "color: #1193d4;\n"
@@ -800,6 +886,11 @@ class Ui_MainWindow(object):
         self.SelectImages.setText(_translate("MainWindow", "Select Images"))
         self.PLLabel.setText(_translate("MainWindow", "Parameter Lock"))
         self.PLExp.setText(_translate("MainWindow", "Exclude parameters from auto-tuning."))
+        self.LensModelLabel.setText(_translate("MainWindow", "Lens Model"))
+        self.LensModelDropDown.setItemText(0, _translate("MainWindow", "Basic"))
+        self.LensModelDropDown.setItemText(1, _translate("MainWindow", "Radial"))
+        self.LensModelDropDown.setItemText(2, _translate("MainWindow", "Extended"))
+        self.MultiStartLabel.setText(_translate("MainWindow", "Optimizer Starts"))
         self.DistortionPLLabel.setText(_translate("MainWindow", "Distortion"))
         self.FLPLLabel.setText(_translate("MainWindow", "Focal Length"))
         self.COSLabel.setText(_translate("MainWindow", "Camera Optics Simulation"))
@@ -818,6 +909,8 @@ class Ui_MainWindow(object):
         self.FLNumber.setText(_translate("MainWindow", "1.00"))
         self.SSLabel.setText(_translate("MainWindow", "Distortion Center"))
         self.SSNumber.setText(_translate("MainWindow", "0 x 0"))
+        self.TangentialLabel.setText(_translate("MainWindow", "Tangential (p1, p2)"))
+        self.TangentialNumber.setText(_translate("MainWindow", "0.0000, 0.0000"))
         self.ApplyParameters.setText(_translate("MainWindow", "Apply Parameters to Simulator"))
 
 import resources_rc
@@ -2,7 +2,9 @@ from PyQt5 import QtWidgets, QtCore
 from autotuning_and_calibration import Ui_MainWindow as Ui_AutotuningAndCalibration
 import cv2
 import numpy as np
-from tuning_thread import TuningThread
+from tuning_thread import TuningThread, MODELS
+from batch_tuning import BatchTuningThread, pair_folders
+from batch_results_dialog import BatchResultsDialog
 import os
 
 class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
@@ -22,6 +24,8 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
         
         self.tuning_thread = None
         self.is_tuning_running = False
+        self.batch_thread = None
+        self.batch_dialog = None
 
         self.reset()
         self.connect_signals()
@@ -53,6 +57,7 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
         self.ui.DistortionNumber.setText(f"0.00")
         self.ui.FLNumber.setText(f"0")
         self.ui.SSNumber.setText(f"0 x 0")
+        self.ui.TangentialNumber.setText("0.0000, 0.0000")
         
         self.is_tuning_running = False
         self.ui.AutoTuningProgress.setText(_translate("MainWindow", "Auto-Tuning Progress"))
@@ -69,6 +74,7 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
         self.ui.ConstraintsText.clicked.connect(self.upload_target_image)
         
         self.ui.StartTuning.clicked.connect(self.start_tuning)
+        self.ui.SelectImages.clicked.connect(self.start_batch)
         # self.ui.ApplyParameters.clicked.connect(self.apply_parameters)
 
     def upload_base_image(self):
@@ -76,7 +82,7 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
         file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select Base Image (Clean/Undistorted)", "", "Images (*.png *.jpg *.jpeg)", options=options)
         if file_name:
             self.base_image_path = file_name
-            self.base_image = cv2.imread(file_name, cv2.IMREAD_GRAYSCALE)
+            self.base_image = self.parent().image_store.get(file_name, cv2.IMREAD_GRAYSCALE)
             self.ui.BaseUploadButton.setText(os.path.basename(file_name))
             self.ui.BaseConstraintsText.setText("Base image loaded.")
             print(f"Base image loaded: {file_name}")
@@ -88,7 +94,7 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
         file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select Target Image (Distorted)", "", "Images (*.png *.jpg *.jpeg)", options=options)
         if file_name:
             self.target_image_path = file_name
-            self.target_image = cv2.imread(file_name, cv2.IMREAD_GRAYSCALE)
+            self.target_image = self.parent().image_store.get(file_name, cv2.IMREAD_GRAYSCALE)
             self.ui.UploadButton.setText(os.path.basename(file_name))
             self.ui.ConstraintsText.setText("Target image loaded.")
             print(f"Target image loaded: {file_name}")
@@ -108,7 +114,7 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
                 return
             
             try:
-                self.base_image = cv2.imread(self.base_image_path, cv2.IMREAD_GRAYSCALE)
+                self.base_image = self.parent().image_store.get(self.base_image_path, cv2.IMREAD_GRAYSCALE)
                 if self.base_image is None:
                     raise Exception("Base image could not be read.")
             except Exception as e:
@@ -129,10 +135,7 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
 
         print("Starting tuning...")
 
-        locks = {
-            'distortion': self.ui.DistortionPLCB.isChecked(),
-            'focal_length': self.ui.FLPLCB.isChecked()
-        }
+        locks = self.get_locks()
 
         h, w = self.base_image.shape
         defaults = {
@@ -152,12 +155,87 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
             self.base_image, 
             self.target_image, 
             locks, 
-            defaults
+            defaults,
+            model=self.ui.LensModelDropDown.currentText(),
+            starts=self.ui.MultiStartSpinBox.value()
         )
         self.tuning_thread.progress_updated.connect(self.on_tuning_progress)
         self.tuning_thread.finished.connect(self.on_tuning_finished)
         self.tuning_thread.start()
 
+    def get_locks(self):
+        return {
+            'distortion': self.ui.DistortionPLCB.isChecked(),
+            'focal_length': self.ui.FLPLCB.isChecked()
+        }
+
+    def select_batch_pairs(self):
+        """Asks for many targets against one base image, or for two folders of base/target pairs."""
+        box = QtWidgets.QMessageBox(self)
+        box.setWindowTitle("Batch Processing")
+        box.setText("Calibrate several target images against the base image, or pair two folders by file name?")
+        targets_button = box.addButton("Target Images", QtWidgets.QMessageBox.AcceptRole)
+        folders_button = box.addButton("Folder Pairs", QtWidgets.QMessageBox.AcceptRole)
+        box.addButton(QtWidgets.QMessageBox.Cancel)
+        box.exec_()
+
+        if box.clickedButton() == targets_button:
+            base_path = self.base_image_path or self.parent().img
+            if base_path is None:
+                self.ui.AutoTuningProgress.setText("Error: No base image uploaded or available in main app.")
+                return []
+            file_names, _ = QtWidgets.QFileDialog.getOpenFileNames(self, "Select Target Images (Distorted)", "", "Images (*.png *.jpg *.jpeg)")
+            return [(base_path, file_name) for file_name in file_names]
+
+        if box.clickedButton() == folders_button:
+            base_dir = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Base Image Folder (Clean/Undistorted)")
+            if not base_dir:
+                return []
+            target_dir = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Target Image Folder (Distorted)")
+            if not target_dir:
+                return []
+            pairs = pair_folders(base_dir, target_dir)
+            if not pairs:
+                self.ui.AutoTuningProgress.setText("Error: No images with matching names in the two folders.")
+            return pairs
+        return []
+
+    def start_batch(self):
+        if self.batch_thread and self.batch_thread.isRunning():
+            self.batch_dialog.raise_()
+            return
+
+        pairs = self.select_batch_pairs()
+        if not pairs:
+            print("No batch images selected.")
+            return
+        print(f"Starting batch tuning of {len(pairs)} image pairs...")
+
+        model = self.ui.LensModelDropDown.currentText()
+        self.batch_dialog = BatchResultsDialog(pairs, MODELS[model], self)
+        self.batch_thread = BatchTuningThread(pairs, self.get_locks(), model=model,
+                                              starts=self.ui.MultiStartSpinBox.value())
+        self.batch_thread.job_started.connect(self.batch_dialog.job_started)
+        self.batch_thread.job_finished.connect(self.batch_dialog.job_finished)
+        self.batch_thread.progress_updated.connect(self.batch_dialog.set_progress)
+        self.batch_thread.finished.connect(self.batch_dialog.batch_finished)
+        self.batch_dialog.stop_button.clicked.connect(self.stop_batch)
+        self.batch_dialog.rejected.connect(self.stop_batch)
+        self.batch_dialog.show()
+        self.batch_thread.start()
+
+    def stop_batch(self):
+        if self.batch_thread and self.batch_thread.isRunning():
+            print("Stopping batch tuning...")
+            self.batch_dialog.stop_button.setEnabled(False)
+            self.batch_thread.stop()
+
+    def close_page(self):
+        self.stop_batch()
+        if self.batch_thread:
+            # stop() does not wait for running jobs, so this returns within a poll interval.
+            self.batch_thread.wait()
+
     def on_tuning_progress(self, value):
         self.ui.ProgressBar.setValue(value)
         self.ui.ProgressPercent.setText(f"{value}%") 
@@ -167,21 +245,41 @@ class AutotuningAndCalibrationLogic(QtWidgets.QMainWindow):
         self.is_tuning_running = False
         self.ui.StartTuning.setEnabled(True)
         self.ui.StartTuning.setText("Start Tuning")
-        self.ui.AutoTuningProgress.setText("Auto-Tuning Complete")
+        stats = self.tuning_thread.match_stats if self.tuning_thread else {}
+        details = []
+        if 'inliers' in stats:
+            details.append(f"{stats['inliers']}/{stats['ratio_matches']} inlier matches")
+        multi_start = self.tuning_thread.multi_start_stats if self.tuning_thread else {}
+        spread = multi_start.get('spread', {})
+        if multi_start:
+            # Starts that reached the same minimum: the fewer, the less trustworthy the fit.
+            details.append(f"{multi_start['agreeing']}/{multi_start['starts']} starts agree")
+        self.ui.AutoTuningProgress.setText(
+            f"Auto-Tuning Complete ({', '.join(details)})" if details else "Auto-Tuning Complete")
         self.ui.ProgressBar.setValue(100)
         self.ui.ProgressPercent.setText("100%") 
         
         self.estimated_params = estimated_params
         
         fl = self.estimated_params['focal_length']
-        k1 = self.estimated_params['k1']
-        cx = self.estimated_params['cx']
-        cy = self.estimated_params['cy']
+        fy = self.estimated_params.get('fy', fl)
+        # The defaults sent back on failure only carry focal_length.
+        shown = dict(self.estimated_params, fx=fl, fy=fy)
+        model = self.tuning_thread.model if self.tuning_thread else MODELS['Basic']
+        radial = [name for name in ('k1', 'k2', 'k3') if name in model] or ['k1']
 
         # Update the UI labels with the new, correct parameter names
-        self.ui.DistortionNumber.setText(f"{k1:.4f}")
-        self.ui.FLNumber.setText(f"{fl:.1f}")
-        self.ui.SSNumber.setText(f"{int(cx)} x {int(cy)}")
+        self.ui.DistortionLabel.setText(f"Distortion ({', '.join(radial)})")
+
+        def value(name, digits):
+            # With multi-start, each fitted value carries the spread of the starts' solutions.
+            text = f"{shown.get(name, 0.0):{digits}}"
+            return f"{text} ±{spread[name]:{digits}}" if name in spread else text
+
+        self.ui.DistortionNumber.setText(", ".join(value(name, '.4f') for name in radial))
+        self.ui.FLNumber.setText(value('fx', '.1f') if fy == fl else f"{value('fx', '.1f')} x {value('fy', '.1f')}")
+        self.ui.SSNumber.setText(f"{value('cx', '.0f')} x {value('cy', '.0f')}")
+        self.ui.TangentialNumber.setText(f"{value('p1', '.4f')}, {value('p2', '.4f')}")
         
     def apply_parameters(self):
         if not self.estimated_params: 
@@ -0,0 +1,184 @@
+"""
+Batch renderer: applies one parameter set to a folder (or glob) of images
+across all CPU cores, without the GUI.
+
+    python batch_render.py captures/ params.json rendered/
+    python batch_render.py "captures/*.jpg" params.json rendered/ --workers 8
+
+The parameter file is a JSON object with the AppWindow.current_params keys
+(zoom, fov, distortion, brightness, ld, shadows, noise, exposure) and an
+optional "resolution" ("1920 x 1080" or [w, h]). Optional "distortion_preset"
+and "sensor" objects hold the Distortion and Sensor page settings, e.g.
+
+    {"zoom": 10, "noise": 3, "resolution": "1280 x 720",
+     "distortion_preset": {"selection": "Barrel", "intensity": 120},
+     "sensor": {"sensor_type": "CCD", "noise_level": 4, "exposure_time": 60}}
+
+Each image goes through lens distortion, then the simulator pipeline, then
+the sensor pipeline. Outputs keep their path below the input folder (or
+the glob matches' common folder); inputs that would share an output name
+are refused. Outputs that already exist are skipped unless --overwrite is
+given.
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import sys
+import time
+import cv2
+import noise
+from map_cache import MAP_CACHE
+from simulation_engine import SimulationEngine
+from sensor_engine import SensorEngine
+from distortion_engine import DistortionEngine
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+_worker = {}
+
+def _init_worker(params, fixed_point=True):
+    # One set of engines per process so the remap cache is reused across images.
+    cv2.setNumThreads(1)
+    noise.set_threads(1)
+    MAP_CACHE.fixed_point = fixed_point
+    _worker['params'] = params
+    _worker['simulation'] = SimulationEngine(memoize=False)
+    _worker['distortion'] = DistortionEngine()
+    _worker['sensor'] = SensorEngine()
+
+def render_image(img, params, simulation=None, distortion=None, sensor=None, rng=None):
+    """Lens distortion -> simulator -> sensor, for one BGR image."""
+    simulation = simulation or SimulationEngine(memoize=False)
+    distortion = distortion or DistortionEngine()
+    sensor = sensor or SensorEngine()
+
+    sim_params = {k: v for k, v in params.items() if k not in ('sensor', 'distortion_preset')}
+    if params.get('distortion_preset'):
+        img = distortion.render(img, params['distortion_preset'])
+    img = simulation.render(img, sim_params, rng=rng)
+    if params.get('sensor'):
+        img = sensor.render(img, params['sensor'], rng=rng)
+    return img
+
+def _render_file(src, dst):
+    img = cv2.imread(src, cv2.IMREAD_COLOR)
+    if img is None:
+        return src, False, "could not be read"
+    result = render_image(img, _worker['params'], _worker['simulation'], _worker['distortion'], _worker['sensor'])
+    if not cv2.imwrite(dst, result):
+        return src, False, "could not be written"
+    return src, True, None
+
+def bounded_imap(executor, fn, iterable, max_in_flight):
+    """
+    Like executor.map, but keeps at most max_in_flight tasks submitted and
+    yields results as they complete, so the input can be arbitrarily long
+    without queueing everything up front.
+    """
+    pending = set()
+    for args in iterable:
+        pending.add(executor.submit(fn, *args))
+        if len(pending) >= max_in_flight:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in concurrent.futures.as_completed(pending):
+        yield future.result()
+
+def collect_inputs(source):
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+
+def input_root(source, inputs):
+    """The folder output paths are made relative to: the input folder, or the glob matches' common folder."""
+    if os.path.isdir(source):
+        return source
+    return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs]) if inputs else '.'
+
+def output_path(src, output_dir, ext, root=None):
+    """
+    src's path below root (just its name without a root) under output_dir,
+    so glob matches from different folders keep their subfolders.
+    """
+    rel = os.path.relpath(os.path.abspath(src), os.path.abspath(root)) if root else os.path.basename(src)
+    stem, src_ext = os.path.splitext(rel)
+    return os.path.join(output_dir, stem + (ext or src_ext))
+
+def find_collisions(pairs):
+    """{output: [inputs]} for outputs that more than one input would write, e.g. a.png and a.jpg with --ext."""
+    sources = {}
+    for src, dst in pairs:
+        sources.setdefault(os.path.normcase(os.path.abspath(dst)), []).append(src)
+    return {dst: srcs for dst, srcs in sources.items() if len(srcs) > 1}
+
+def load_params(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a folder of images with one simulator parameter set.")
+    parser.add_argument('input', help="Input folder or glob pattern.")
+    parser.add_argument('params', help="JSON parameter file.")
+    parser.add_argument('output', help="Output folder.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help="Images queued or rendering at once (default: 2 x workers). Bounds memory use.")
+    parser.add_argument('--float-maps', action='store_true',
+                        help="Use float32 remap maps instead of fixed-point ones (slower, full sub-pixel precision).")
+    parser.add_argument('--ext', default=None, help="Output extension, e.g. .png (default: keep the input's).")
+    parser.add_argument('--overwrite', action='store_true', help="Re-render outputs that already exist.")
+    args = parser.parse_args(argv)
+
+    params = load_params(args.params)
+    os.makedirs(args.output, exist_ok=True)
+
+    inputs = collect_inputs(args.input)
+    root = input_root(args.input, inputs)
+    outputs = [(src, output_path(src, args.output, args.ext, root)) for src in inputs]
+    collisions = find_collisions(outputs)
+    if collisions:
+        # Refused up front: one would overwrite the other, or be skipped as already rendered.
+        print(f"{len(collisions)} output files would be written by more than one input:")
+        for dst, srcs in sorted(collisions.items()):
+            print(f"  {dst}: {', '.join(srcs)}")
+        print("Rename the inputs or drop --ext.")
+        return 2
+
+    jobs = []
+    skipped = 0
+    for src, dst in outputs:
+        if not args.overwrite and os.path.exists(dst):
+            skipped += 1
+            continue
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        jobs.append((src, dst))
+
+    print(f"{len(inputs)} images found, {skipped} already rendered, {len(jobs)} to render with {args.workers} workers.")
+    if not jobs:
+        return 0
+
+    max_in_flight = args.max_in_flight or 2 * args.workers
+    failures = 0
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                                initargs=(params, not args.float_maps)) as executor:
+        for done, (src, ok, error) in enumerate(bounded_imap(executor, _render_file, jobs, max_in_flight), 1):
+            if not ok:
+                failures += 1
+                print(f"  {src}: {error}")
+            if done % 10 == 0 or done == len(jobs):
+                elapsed = time.perf_counter() - start
+                print(f"  {done}/{len(jobs)} rendered, {done / elapsed:.2f} images/s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {len(jobs) - failures} rendered, {failures} failed in {elapsed:.1f} s "
+          f"({len(jobs) / elapsed:.2f} images/s).")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
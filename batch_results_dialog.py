@@ -0,0 +1,132 @@
+from PyQt5 import QtWidgets, QtCore
+import os
+from batch_tuning import aggregate, export_csv, export_json
+from tuning_thread import PARAMETERS
+
+def format_parameter(name, value, spread=None):
+    """value, and its multi-start spread as +/- when there is one."""
+    digits = '.1f' if name in ('fx', 'fy', 'cx', 'cy') else '+.4f'
+    text = f"{value:{digits}}"
+    return text if spread is None else f"{text} ±{spread:{digits.lstrip('+')}}"
+
+class BatchResultsDialog(QtWidgets.QDialog):
+    """
+    Live results table for a BatchTuningThread, with CSV/JSON export once it
+    finishes. parameters are the PARAMETERS names shown as columns.
+    """
+
+    def __init__(self, pairs, parameters=PARAMETERS, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Batch Auto-Tuning")
+        self.resize(980, 480)
+        self.setStyleSheet("""
+            QDialog { background-color: #0f1b23; }
+            QLabel { color: #e5e7eb; font-size: 14px; }
+            QTableWidget {
+                color: #e5e7eb;
+                background-color: #111827;
+                gridline-color: #1f2937;
+                border: 1px solid #374151;
+            }
+            QHeaderView::section {
+                color: #9ca3af;
+                background-color: #1f2937;
+                border: none;
+                padding: 4px;
+            }
+            QPushButton {
+                color: #ffffff;
+                background-color: #1193d4;
+                border: none;
+                border-radius: 4px;
+                padding: 8px 16px;
+            }
+            QPushButton:disabled { background-color: #374151; color: #9ca3af; }
+        """)
+        self.rows = []
+        self.parameters = tuple(parameters)
+        columns = ('#', 'Base', 'Target', 'Status') + self.parameters + ('Inliers', 'RMS px', 'Time s')
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.table = QtWidgets.QTableWidget(len(pairs), len(columns), self)
+        self.table.setHorizontalHeaderLabels(columns)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        for i, (base, target) in enumerate(pairs):
+            for col, text in enumerate((str(i + 1), os.path.basename(base), os.path.basename(target), 'queued')):
+                self.table.setItem(i, col, QtWidgets.QTableWidgetItem(text))
+        layout.addWidget(self.table)
+
+        self.progress = QtWidgets.QProgressBar(self)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+        self.summary = QtWidgets.QLabel(f"0 / {len(pairs)} calibrations finished", self)
+        self.summary.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addStretch()
+        self.stop_button = QtWidgets.QPushButton("Stop", self)
+        self.export_csv_button = QtWidgets.QPushButton("Export CSV", self)
+        self.export_json_button = QtWidgets.QPushButton("Export JSON", self)
+        self.export_csv_button.setEnabled(False)
+        self.export_json_button.setEnabled(False)
+        self.export_csv_button.clicked.connect(self.export_csv)
+        self.export_json_button.clicked.connect(self.export_json)
+        for button in (self.stop_button, self.export_csv_button, self.export_json_button):
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+        self.total = len(pairs)
+
+    def job_started(self, index):
+        self.table.item(index, 3).setText('running')
+
+    def job_finished(self, row):
+        self.rows.append(row)
+        i = row['index']
+        values = [row['status'] if row['status'] == 'done' else f"failed: {row['error']}"]
+        if row['status'] == 'done':
+            values += [format_parameter(name, row[name], row.get(f'{name}_spread')) for name in self.parameters]
+            values += [str(row['inliers']), f"{row['rms_px']:.3f}"]
+        else:
+            values += [''] * (len(self.parameters) + 2)
+        values.append(f"{row['seconds']:.1f}")
+        for col, text in enumerate(values, 3):
+            self.table.setItem(i, col, QtWidgets.QTableWidgetItem(text))
+        self.summary.setText(f"{len(self.rows)} / {self.total} calibrations finished")
+
+    def set_progress(self, value):
+        self.progress.setValue(value)
+
+    def batch_finished(self, rows):
+        self.rows = list(rows)
+        self.stop_button.setEnabled(False)
+        self.export_csv_button.setEnabled(bool(self.rows))
+        self.export_json_button.setEnabled(bool(self.rows))
+        self.progress.setValue(100 if len(self.rows) == self.total else self.progress.value())
+        finished = {row['index'] for row in self.rows}
+        for i in range(self.total):
+            if i not in finished:
+                self.table.item(i, 3).setText('stopped')
+
+        summary = aggregate(self.rows)
+        lines = [f"{summary['succeeded']} succeeded, {summary['failed']} failed of {self.total}."]
+        for name in self.parameters:
+            s = summary[name]
+            if s['mean'] is not None:
+                lines.append(f"{name}: mean {s['mean']:.4f}, std {s['std']:.4f}")
+        self.summary.setText("   ".join(lines))
+
+    def export_csv(self):
+        file_name, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Batch Results", "batch_tuning.csv", "CSV (*.csv)")
+        if file_name:
+            export_csv(self.rows, file_name)
+            print(f"Batch results written to {file_name}")
+
+    def export_json(self):
+        file_name, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Batch Results", "batch_tuning.json", "JSON (*.json)")
+        if file_name:
+            export_json(self.rows, file_name)
+            print(f"Batch results written to {file_name}")
@@ -0,0 +1,171 @@
+import concurrent.futures
+import csv
+import json
+import multiprocessing
+import os
+import time
+import traceback
+import cv2
+import numpy as np
+from PyQt5.QtCore import pyqtSignal, QThread
+from batch_render import IMAGE_EXTENSIONS
+from tuning_thread import TuningThread, PARAMETERS, residuals
+
+# Multi-start spread (std over the converged starts) of each parameter, blank when not fitted.
+SPREAD_FIELDS = tuple(f'{name}_spread' for name in PARAMETERS)
+CSV_FIELDS = (('index', 'base', 'target', 'status') + PARAMETERS + ('inliers', 'starts_agreeing') + SPREAD_FIELDS
+              + ('rms_px', 'seconds', 'error'))
+
+def pair_folders(base_dir, target_dir):
+    """Pairs images in two folders by file name (without extension)."""
+    def by_stem(folder):
+        return {os.path.splitext(name)[0]: os.path.join(folder, name)
+                for name in sorted(os.listdir(folder)) if name.lower().endswith(IMAGE_EXTENSIONS)}
+    bases, targets = by_stem(base_dir), by_stem(target_dir)
+    return [(bases[stem], targets[stem]) for stem in sorted(bases) if stem in targets]
+
+def calibrate_pair(index, base_path, target_path, locks, solver='least_squares', loss='soft_l1', model='Basic', starts=1):
+    """
+    One TuningThread calibration, run synchronously (in a pool worker).
+    Returns a result row for the table and the exports.
+    """
+    row = {'index': index, 'base': base_path, 'target': target_path, 'status': 'failed', 'error': ''}
+    start = time.perf_counter()
+    try:
+        base = cv2.imread(base_path, cv2.IMREAD_GRAYSCALE)
+        target = cv2.imread(target_path, cv2.IMREAD_GRAYSCALE)
+        if base is None or target is None:
+            raise Exception("Image could not be read.")
+
+        h, w = base.shape
+        defaults = {'focal_length': w * 0.8, 'k1': 0.0, 'cx': w / 2, 'cy': h / 2}
+        # Already in a pool worker, so multi-start runs in-process.
+        thread = TuningThread(base, target, locks, defaults, solver=solver, loss=loss, model=model,
+                              starts=starts, workers=1)
+        thread.callback = lambda xk: None
+
+        res, base_pts, target_pts = thread._match_and_optimize()
+        if not res.success:
+            raise Exception(f"Optimization failed: {res.message}")
+
+        errors = residuals(res.x, base_pts.astype(np.float64), target_pts.astype(np.float64))
+        row.update(thread._unflatten_params(res.x))
+        row['inliers'] = thread.match_stats.get('inliers', len(base_pts))
+        row['starts_agreeing'] = thread.multi_start_stats.get('agreeing', 1)
+        row.update({f'{name}_spread': std for name, std in thread.multi_start_stats.get('spread', {}).items()})
+        row['rms_px'] = float(np.sqrt(np.mean(errors ** 2)))
+        row['status'] = 'done'
+    except Exception as e:
+        row['error'] = str(e)
+    row['seconds'] = time.perf_counter() - start
+    return row
+
+def aggregate(rows):
+    """Mean and standard deviation of every fitted parameter over the successful rows."""
+    done = [r for r in rows if r.get('status') == 'done']
+    summary = {'jobs': len(rows), 'succeeded': len(done), 'failed': len(rows) - len(done)}
+    for name in PARAMETERS:
+        values = np.array([r[name] for r in done], dtype=np.float64)
+        if len(values) == 0:
+            summary[name] = {'mean': None, 'std': None}
+        else:
+            std = values.std(ddof=1) if len(values) > 1 else 0.0
+            summary[name] = {'mean': float(values.mean()), 'std': float(std)}
+    return summary
+
+def export_csv(rows, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in sorted(rows, key=lambda r: r['index']):
+            writer.writerow(row)
+
+def export_json(rows, path):
+    with open(path, 'w') as f:
+        json.dump({'summary': aggregate(rows), 'results': sorted(rows, key=lambda r: r['index'])}, f, indent=2)
+
+class BatchTuningThread(QThread):
+    """
+    Runs calibrate_pair for many (base, target) pairs in a process pool.
+    job_started fires when a job should have reached a worker (the pool
+    runs jobs in submission order, workers at a time), job_finished carries
+    each result row as it completes, and finished carries all rows once the
+    batch is over (or stopped).
+    """
+    job_started = pyqtSignal(int)
+    job_finished = pyqtSignal(dict)
+    progress_updated = pyqtSignal(int)
+    finished = pyqtSignal(list)
+
+    # How often run() checks for stop() while jobs are running, in seconds.
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, pairs, locks, workers=None, solver='least_squares', loss='soft_l1', model='Basic', starts=1,
+                 parent=None):
+        super().__init__(parent)
+        self.pairs = list(pairs)
+        self.locks = locks
+        self.workers = workers or os.cpu_count() or 1
+        self.solver = solver
+        self.loss = loss
+        self.model = model
+        self.starts = starts
+        self.rows = []
+        self._stopping = False
+        self._executor = None
+
+    def stop(self):
+        """
+        Cancels the queued jobs and returns straight away; run() emits
+        finished with the rows done so far within POLL_INTERVAL. Jobs already
+        running finish in their worker processes, but nothing waits for them.
+        """
+        self._stopping = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self):
+        jobs = [(i, base, target, self.locks, self.solver, self.loss, self.model, self.starts)
+                for i, (base, target) in enumerate(self.pairs)]
+        try:
+            # Spawned workers, since forking a process that runs Qt threads is unsafe.
+            context = multiprocessing.get_context('spawn')
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            # Only 2 x workers jobs are ever submitted, so the pool always has the next one queued.
+            max_in_flight = 2 * self.workers
+            pending = set()
+            submitted = 0
+            for i in range(min(self.workers, len(jobs))):
+                self.job_started.emit(i)
+            next_started = self.workers
+            while not self._stopping and (pending or submitted < len(jobs)):
+                try:
+                    while submitted < len(jobs) and len(pending) < max_in_flight:
+                        pending.add(self._executor.submit(calibrate_pair, *jobs[submitted]))
+                        submitted += 1
+                except RuntimeError:
+                    # stop() shut the pool down between the check and the submit.
+                    if not self._stopping:
+                        raise
+                    break
+                done, pending = concurrent.futures.wait(pending, timeout=self.POLL_INTERVAL,
+                                                        return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    row = future.result()
+                    self.rows.append(row)
+                    self.job_finished.emit(row)
+                    self.progress_updated.emit(int(len(self.rows) / len(jobs) * 100))
+                    if next_started < len(jobs):
+                        self.job_started.emit(next_started)
+                        next_started += 1
+            for future in pending:
+                future.cancel()
+        except Exception:
+            print("\n!!!!!!!!!! BATCH TUNING CRASHED !!!!!!!!!!")
+            traceback.print_exc()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+        self.finished.emit(self.rows)
@@ -0,0 +1,239 @@
+"""
+Benchmark suite for the simulation stages.
+
+Times every stage of the simulator, sensor, metrics and auto-tuning
+pipelines on deterministic synthetic images at the standard resolutions,
+writes the results as JSON and compares them against a stored baseline.
+
+    python benchmark.py                                  # all stages, all sizes
+    python benchmark.py --resolutions 800x600 1920x1080 --stages apply_fov lighting
+    python benchmark.py --save-baseline benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json --threshold 0.25
+
+Exits with status 1 when a stage is slower than its baseline by more than
+--threshold (relative) and --min-delta-ms (absolute).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import cv2
+import numpy as np
+from map_cache import MapCache
+from simulation_engine import SimulationEngine
+from sensor_engine import SensorEngine
+from distortion_engine import DistortionEngine, brown_conrady_maps
+from feature_cache import FeatureCache
+from metrics import comparison_grays, compute_ssim, compute_psnr
+
+RESOLUTIONS = {
+    '800x600': (800, 600),
+    '1280x720': (1280, 720),
+    '1920x1080': (1920, 1080),
+    '4K': (3840, 2160),
+    '20MP': (5472, 3648)
+}
+
+def synthetic_image(w, h, seed=0):
+    """Blocky, blurred texture with circles: deterministic and feature-rich."""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (max(1, h // 24), max(1, w // 24), 3), dtype=np.uint8)
+    img = cv2.resize(small, (w, h), interpolation=cv2.INTER_NEAREST)
+    img = cv2.GaussianBlur(img, (0, 0), 1.5)
+    for _ in range(60):
+        center = (int(rng.integers(0, w)), int(rng.integers(0, h)))
+        radius = int(rng.integers(max(2, w // 200), max(3, w // 20)))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.circle(img, center, radius, color, max(1, w // 400))
+    return img
+
+def distorted_target(gray, k1=0.05):
+    h, w = gray.shape
+    K = np.array([[0.8 * w, 0, w / 2], [0, 0.8 * w, h / 2], [0, 0, 1]], dtype=np.float32)
+    D = np.array([k1, 0, 0, 0], dtype=np.float32)
+    map_x, map_y = cv2.initUndistortRectifyMap(K, D, None, K, (w, h), cv2.CV_32FC1)
+    return cv2.remap(gray, map_x, map_y, interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+
+def _tuning_thread(ctx, solver='least_squares', **kwargs):
+    from tuning_thread import TuningThread
+    h, w = ctx['gray'].shape
+    defaults = {'focal_length': w * 0.8, 'k1': 0.0, 'cx': w / 2, 'cy': h / 2}
+    thread = TuningThread(ctx['gray'], ctx['target'], {}, defaults, solver=solver, **kwargs)
+    thread.callback = lambda xk: None
+    thread.feature_cache = None
+    return thread
+
+def _matches(ctx):
+    if 'matches' not in ctx:
+        from tuning_thread import TuningThread
+        ctx['matches'] = TuningThread._find_and_match_features(ctx['gray'], ctx['target'], feature_cache=None)
+    return ctx['matches']
+
+def _match_cached(ctx):
+    from tuning_thread import TuningThread
+    return TuningThread._find_and_match_features(ctx['gray'], ctx['target'], feature_cache=features)
+
+def _rematch(ctx):
+    ctx.pop('matches', None)
+    return _matches(ctx)
+
+cold = SimulationEngine(map_cache=MapCache(max_bytes=0), memoize=False)
+warm = SimulationEngine(map_cache=MapCache(), memoize=False)
+warm_float = SimulationEngine(map_cache=MapCache(fixed_point=False), memoize=False)
+sensor = SensorEngine()
+lens = DistortionEngine(map_cache=MapCache(max_bytes=0))
+FISHEYE = {'selection': 'Fisheye', 'intensity': 200}
+features = FeatureCache(directory=None)
+
+# name -> (function of the per-resolution context, default repeat override)
+STAGES = {
+    'apply_zoom': (lambda c: cold.apply_zoom(c['img'], 30), None),
+    'apply_fov': (lambda c: cold.apply_fov(c['img'], 80), None),
+    'apply_fov.cached': (lambda c: warm.apply_fov(c['img'], 80), None),
+    'apply_distortion': (lambda c: cold.apply_distortion(c['img'], 150), None),
+    'apply_distortion.cached': (lambda c: warm.apply_distortion(c['img'], 150), None),
+    'geometry': (lambda c: cold.apply_geometry(c['img'], 30, 80, 150), None),
+    'geometry.cached': (lambda c: warm.apply_geometry(c['img'], 30, 80, 150), None),
+    'geometry.cached.float': (lambda c: warm_float.apply_geometry(c['img'], 30, 80, 150), None),
+    'lighting': (lambda c: cold.apply_lighting(c['img'], 20, 120, 40, 50), None),
+    'exposure': (lambda c: cold.apply_lighting(c['img'], 0, 45, 0, 70), None),
+    'noise': (lambda c: cold.apply_noise(c['img'], 10), None),
+    'resolution': (lambda c: cold.apply_resolution(c['img'], (1280, 720)), None),
+    'render': (lambda c: cold.render(c['img'], {'zoom': 30, 'fov': 80, 'distortion': 150, 'brightness': 20,
+                                                'ld': 120, 'shadows': 40, 'noise': 10, 'exposure': 70,
+                                                'resolution': (1280, 720)}), None),
+    'distortion.maps': (lambda c: brown_conrady_maps(c['img'].shape[1], c['img'].shape[0],
+                                                     lens.coefficients('Fisheye', 200), c['img'].shape[1] / 2,
+                                                     c['img'].shape[0] / 2), None),
+    'distortion.render': (lambda c: lens.render(c['img'], FISHEYE), None),
+    'sensor.noise.CMOS': (lambda c: sensor.apply_noise(c['img'], 'CMOS', 10), None),
+    'sensor.noise.CCD': (lambda c: sensor.apply_noise(c['img'], 'CCD', 10), None),
+    'sensor.noise.sCMOS': (lambda c: sensor.apply_noise(c['img'], 'sCMOS', 10), None),
+    'sensor.exposure_time': (lambda c: sensor.apply_exposure_time(c['img'], 70), None),
+    'sensor.dynamic_range': (lambda c: sensor.apply_dynamic_range(c['img'], 20, 230), None),
+    'sensor.tone': (lambda c: sensor.apply_tone(c['img'], 70, 20, 230), None),
+    'sensor.mosaic': (lambda c: sensor.apply_mosaic(c['img'], 'RGGB'), None),
+    'sensor.demosaic.Bilinear': (lambda c: sensor.apply_demosaic(c['raw'], 'RGGB', 'Bilinear'), None),
+    'sensor.demosaic.Edge-aware': (lambda c: sensor.apply_demosaic(c['raw'], 'RGGB', 'Edge-aware'), None),
+    'sensor.demosaic.VNG': (lambda c: sensor.apply_demosaic(c['raw'], 'RGGB', 'VNG'), None),
+    'metrics.ssim': (lambda c: compute_ssim(*c['grays']), None),
+    'metrics.psnr': (lambda c: compute_psnr(*c['grays']), None),
+    'tuning.match': (_rematch, 1),
+    'tuning.match.cached': (_match_cached, None),
+    # Warmup computes the matches, so only the fit itself is timed.
+    'tuning.optimize': (lambda c: _tuning_thread(c)._optimize(*_matches(c)), None),
+    'tuning.optimize.lbfgsb': (lambda c: _tuning_thread(c, 'lbfgsb')._optimize(*_matches(c)), None),
+    'tuning.optimize.extended': (lambda c: _tuning_thread(c, model='Extended')._optimize(*_matches(c)), None),
+    'tuning.optimize.multistart': (lambda c: _tuning_thread(c, starts=8, workers=1)._optimize(*_matches(c)), None),
+    # Matching and fitting end to end; coarse-to-fine kicks in above 2048 px.
+    'tuning.calibrate': (lambda c: _tuning_thread(c)._match_and_optimize(), 1),
+    'tuning.calibrate.full_resolution': (lambda c: _tuning_thread(c, coarse_max_side=None)._match_and_optimize(), 1)
+}
+
+def make_context(w, h):
+    img = synthetic_image(w, h)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    sim_rgb = cv2.cvtColor(cold.apply_lighting(img, 10, 45, 0, 60), cv2.COLOR_BGR2RGB)
+    return {
+        'img': img,
+        'gray': gray,
+        'raw': sensor.apply_mosaic(img, 'RGGB'),
+        'target': distorted_target(gray),
+        'grays': comparison_grays(img, sim_rgb)
+    }
+
+def time_stage(fn, ctx, repeat, warmup):
+    for _ in range(warmup):
+        fn(ctx)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ctx)
+        times.append(time.perf_counter() - start)
+    return {'min_s': min(times), 'median_s': statistics.median(times), 'repeats': repeat}
+
+def run(resolutions, stages, repeat, warmup):
+    results = {}
+    for res_name in resolutions:
+        w, h = RESOLUTIONS[res_name]
+        print(f"\n== {res_name} ({w}x{h}) ==")
+        ctx = make_context(w, h)
+        results[res_name] = {}
+        for stage in stages:
+            fn, repeat_override = STAGES[stage]
+            n = repeat_override or repeat
+            try:
+                r = time_stage(fn, ctx, n, warmup if repeat_override is None else 0)
+            except Exception as e:
+                print(f"{stage:<26} FAILED: {e}")
+                continue
+            results[res_name][stage] = r
+            print(f"{stage:<26} median {r['median_s'] * 1000:9.2f} ms   min {r['min_s'] * 1000:9.2f} ms")
+    return results
+
+def compare(results, baseline, threshold, min_delta_s):
+    regressions = []
+    for res_name, stages in results.items():
+        for stage, r in stages.items():
+            base = baseline.get('results', {}).get(res_name, {}).get(stage)
+            if base is None:
+                continue
+            delta = r['median_s'] - base['median_s']
+            if delta > min_delta_s and r['median_s'] > base['median_s'] * (1 + threshold):
+                regressions.append((res_name, stage, base['median_s'], r['median_s']))
+    return regressions
+
+def metadata():
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every simulation stage across standard resolutions.")
+    parser.add_argument('--resolutions', nargs='+', default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Baseline JSON to compare against.")
+    parser.add_argument('--save-baseline', help="Also write the results to this path as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%).")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="Ignore slowdowns smaller than this.")
+    args = parser.parse_args(argv)
+
+    cv2.setRNGSeed(0)
+    np.random.seed(0)
+    data = {'meta': metadata(), 'results': run(args.resolutions, args.stages, args.repeat, args.warmup)}
+
+    with open(args.output, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(data['results'], baseline, args.threshold, args.min_delta_ms / 1000.0)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for res_name, stage, before, after in regressions:
+                print(f"  {res_name:<10} {stage:<26} {before * 1000:9.2f} ms -> {after * 1000:9.2f} ms "
+                      f"(+{(after / before - 1) * 100:.0f}%)")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
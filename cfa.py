@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+# Colour of each site of the 2x2 tile, top-left first, as a BGR channel index.
+CFA_PATTERNS = {
+    'RGGB': ((2, 1), (1, 0)),
+    'BGGR': ((0, 1), (1, 2)),
+    'GRBG': ((1, 2), (0, 1)),
+    'GBRG': ((1, 0), (2, 1))
+}
+
+# OpenCV names Bayer layouts after the second row, so its codes are offset
+# by one from the conventional top-left names.
+_OPENCV_CODES = {'RGGB': 'BG', 'BGGR': 'RG', 'GRBG': 'GB', 'GBRG': 'GR'}
+
+DEMOSAIC_METHODS = {
+    'Bilinear': '',
+    'Edge-aware': '_EA',
+    'VNG': '_VNG'
+}
+
+def mosaic(img, pattern):
+    """
+    Samples a BGR image through a Bayer colour filter array into a single
+    channel raw frame. Each of the four tile sites is copied straight from a
+    strided view of the source, so no per-channel planes are materialised.
+    """
+    tile = CFA_PATTERNS[pattern]
+    raw = np.empty(img.shape[:2], dtype=img.dtype)
+    for dy in (0, 1):
+        for dx in (0, 1):
+            raw[dy::2, dx::2] = img[dy::2, dx::2, tile[dy][dx]]
+    return raw
+
+def demosaic(raw, pattern, method='Bilinear'):
+    """Reconstructs a BGR image from a raw Bayer frame."""
+    code = getattr(cv2, f'COLOR_Bayer{_OPENCV_CODES[pattern]}2BGR{DEMOSAIC_METHODS[method]}')
+    return cv2.cvtColor(raw, code)
+
+def raw_to_bgr(raw, pattern):
+    """Shows a raw frame with every site in its filter colour, for display."""
+    tile = CFA_PATTERNS[pattern]
+    img = np.zeros(raw.shape + (3,), dtype=raw.dtype)
+    for dy in (0, 1):
+        for dx in (0, 1):
+            img[dy::2, dx::2, tile[dy][dx]] = raw[dy::2, dx::2]
+    return img
@@ -1,8 +1,7 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 from comparison_and_metrics_display import Ui_MainWindow as Ui_ComparisonAndMetricsDisplay
+from metrics import comparison_grays, compute_ssim, compute_psnr
 import cv2
-from skimage.metrics import structural_similarity as ssim
-from skimage.metrics import peak_signal_noise_ratio as psnr
 
 class ComparisonAndMetricsDisplayLogic(QtWidgets.QMainWindow):
     def __init__(self, parent=None, sim=None, img_size=None):
@@ -41,7 +40,7 @@ class ComparisonAndMetricsDisplayLogic(QtWidgets.QMainWindow):
         file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select an Image", "", "Images (*.png *.jpg *.jpeg *.svg)", options=options)
         if file_name:
             print(f"Selected file: {file_name}")
-            self.real_img_cv = cv2.imread(file_name)
+            self.real_img_cv = self.parent().image_store.get(file_name)
             self.ui.UploadButton.setText(file_name.split('/')[-1])
             self.ui.ConstraintsText.setText('File Uploaded')
             self.run_comparison()
@@ -51,19 +50,16 @@ class ComparisonAndMetricsDisplayLogic(QtWidgets.QMainWindow):
     def run_comparison(self):
         if self.real_img_cv is None or self.sim is None:
             return
-        h, w = self.sim.shape[:2]
-        real_resized_bgr = cv2.resize(self.real_img_cv, (w, h), interpolation=cv2.INTER_AREA)
-        real_gray = cv2.cvtColor(real_resized_bgr, cv2.COLOR_BGR2GRAY)
-        sim_gray = cv2.cvtColor(self.sim, cv2.COLOR_RGB2GRAY)
+        profiler = self.parent().profiler
+        real_gray, sim_gray = profiler.measure('metrics.prepare', comparison_grays, self.real_img_cv, self.sim)
         try:
-            data_range = sim_gray.max() - sim_gray.min()
-            ssim_score = ssim(real_gray, sim_gray, data_range=data_range)
+            ssim_score = profiler.measure('metrics.ssim', compute_ssim, real_gray, sim_gray)
             self.ui.SSIMValue.setText(f"{ssim_score:.4f}")
         except Exception as e:
             print(f"Error calculating SSIM: {e}")
             self.ui.SSIMValue.setText("Error")
         try:
-            psnr_score = psnr(real_gray, sim_gray, data_range=data_range)
+            psnr_score = profiler.measure('metrics.psnr', compute_psnr, real_gray, sim_gray)
             if psnr_score == float('inf'):
                 self.ui.PSNRValue.setText("Perfect")
             else:
@@ -72,15 +68,17 @@ class ComparisonAndMetricsDisplayLogic(QtWidgets.QMainWindow):
             print(f"Error calculating PSNR: {e}")
             self.ui.PSNRValue.setText("Error")
         try:
-            diff_img = cv2.absdiff(real_gray, sim_gray)
-            diff_colormap = cv2.applyColorMap(diff_img, cv2.COLORMAP_HOT)
+            with profiler.stage('metrics.diff_map'):
+                diff_img = cv2.absdiff(real_gray, sim_gray)
+                diff_colormap = cv2.applyColorMap(diff_img, cv2.COLORMAP_HOT)
             self.display_image(diff_colormap, self.ui.MapImage, self.ui.MapImage.size())
         except Exception as e:
             print(f"Error creating difference map: {e}")
         try:
-            real_hist = cv2.calcHist([real_gray], [0], None, [256], [0, 256])
+            with profiler.stage('metrics.histograms'):
+                real_hist = cv2.calcHist([real_gray], [0], None, [256], [0, 256])
+                sim_hist = cv2.calcHist([sim_gray], [0], None, [256], [0, 256])
             self.ui.RealHistogram.setData(real_hist.flatten().astype(float))
-            sim_hist = cv2.calcHist([sim_gray], [0], None, [256], [0, 256])
             self.ui.SimulatedHistogram.setData(sim_hist.flatten().astype(float))
         except Exception as e:
             print(f"Error generating histograms: {e}")
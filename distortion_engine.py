@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+from map_cache import MAP_CACHE
+
+# OpenCV's distortion vector order.
+COEFFICIENTS = ('k1', 'k2', 'p1', 'p2', 'k3', 'k4', 'k5', 'k6')
+
+# Named lenses as Brown-Conrady coefficient sets at full strength; the
+# intensity slider scales them by intensity / 1000. Radii are normalised by
+# the image half-diagonal, so a preset looks the same at any resolution.
+DISTORTION_PRESETS = {
+    'None': {},
+    'Barrel': {'k1': 1.0},
+    'Pincushion': {'k1': -1.0},
+    'Mustache': {'k1': 1.0, 'k2': -1.2},
+    'Wide Angle': {'k1': 1.0, 'k2': 0.4, 'k3': 0.1},
+    'Telephoto': {'k1': -0.6, 'k2': -0.2},
+    'Decentered': {'k1': 0.6, 'p1': 0.08, 'p2': -0.05},
+    'Fisheye': {'k1': 1.6, 'k2': 0.6, 'k4': 0.8, 'k5': 0.2}
+}
+
+# Older parameter files and the page's radio button call it 'Pinpoint'.
+PRESET_ALIASES = {'Pinpoint': 'Pincushion'}
+
+DEFAULT_DISTORTION_PARAMS = {
+    'selection': 'None',
+    'intensity': 0,
+    'coefficients': None,
+    'cx': None,
+    'cy': None
+}
+
+def brown_conrady_maps(w, h, coefficients, cx, cy):
+    """
+    Remap coordinates for radial (k1-k3), tangential (p1, p2) and rational
+    (k4-k6) distortion about (cx, cy), built by cv2.initUndistortRectifyMap.
+    """
+    f = max(np.hypot(w / 2, h / 2), 1.0)
+    K = np.array([[f, 0, cx], [0, f, cy], [0, 0, 1]], dtype=np.float64)
+    D = np.array([coefficients.get(k, 0.0) for k in COEFFICIENTS], dtype=np.float64)
+    return cv2.initUndistortRectifyMap(K, D, None, K, (w, h), cv2.CV_32FC1)
+
+class DistortionEngine:
+    """
+    Qt-free version of the Distortion Presets and Customisation page.
+    'selection' is a DISTORTION_PRESETS name scaled by 'intensity' (the
+    slider value), or 'Custom' to use the 'coefficients' dict as given.
+    cx/cy are the distortion centre in source pixels, defaulting to the
+    image centre. Maps are built on first use for each image size and kept
+    in map_cache, defaulting to the process-wide MAP_CACHE.
+    """
+
+    def __init__(self, map_cache=None):
+        self.map_cache = map_cache if map_cache is not None else MAP_CACHE
+
+    @staticmethod
+    def coefficients(selection, intensity, custom=None):
+        if selection == 'Custom':
+            return {k: float((custom or {}).get(k, 0.0)) for k in COEFFICIENTS}
+        preset = DISTORTION_PRESETS[PRESET_ALIASES.get(selection, selection)]
+        return {k: preset.get(k, 0.0) * intensity / 1000.0 for k in COEFFICIENTS}
+
+    def maps(self, w, h, coefficients, cx, cy):
+        key = ('brown-conrady', w, h, tuple(coefficients.get(k, 0.0) for k in COEFFICIENTS), cx, cy)
+        return self.map_cache.remap_maps(key, lambda: brown_conrady_maps(w, h, coefficients, cx, cy))
+
+    def render(self, img, params):
+        p = dict(DEFAULT_DISTORTION_PARAMS)
+        p.update(params)
+
+        coefficients = self.coefficients(p['selection'], p['intensity'], p['coefficients'])
+        if not any(coefficients.values()):
+            return img
+        h, w = img.shape[:2]
+        cx = w // 2 if p['cx'] is None else p['cx']
+        cy = h // 2 if p['cy'] is None else p['cy']
+        map1, map2 = self.maps(w, h, coefficients, cx, cy)
+        return cv2.remap(img, map1, map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
@@ -159,6 +159,142 @@ class Ui_MainWindow(object):
         self.Nonee.setObjectName("Nonee")
         self.horizontalLayout_14.addWidget(self.Nonee)
         self.verticalLayout_3.addWidget(self.DistortionTypeRadios)
+        self.Preset = QtWidgets.QWidget(self.Parameters)
+        self.Preset.setEnabled(True)
+        self.Preset.setObjectName("Preset")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.Preset)
+        self.verticalLayout_7.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_7.setSpacing(8)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.PresetLabel = QtWidgets.QLabel(self.Preset)
+        self.PresetLabel.setStyleSheet("font-size: 14px;\n"
+"color: #e5e7eb;")
+        self.PresetLabel.setFont(space_grotesk)
+        self.PresetLabel.setObjectName("PresetLabel")
+        self.verticalLayout_7.addWidget(self.PresetLabel)
+        self.PresetDropDown = QtWidgets.QComboBox(self.Preset)
+        self.PresetDropDown.setStyleSheet("color: #e5e7eb;\n"
+"font-size: 14px;\n"
+"background-color: #1f2937;\n"
+"padding: 8px 40px 8px 12px;\n"
+"border-color: rgb(55 65 81);\n"
+"border-radius: 4px")
+        self.PresetDropDown.setFont(space_grotesk)
+        self.PresetDropDown.setObjectName("PresetDropDown")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.PresetDropDown.addItem("")
+        self.verticalLayout_7.addWidget(self.PresetDropDown)
+        self.verticalLayout_3.addWidget(self.Preset)
+        self.Coefficients = QtWidgets.QWidget(self.Parameters)
+        self.Coefficients.setEnabled(True)
+        self.Coefficients.setStyleSheet("QLabel {\n"
+"    font-size: 14px;\n"
+"    color: #e5e7eb;\n"
+"}\n"
+"\n"
+"QDoubleSpinBox {\n"
+"    color: #e5e7eb;\n"
+"    font-size: 14px;\n"
+"    background-color: #1f2937;\n"
+"    padding: 4px 8px;\n"
+"    border: 1px solid #374151;\n"
+"    border-radius: 4px;\n"
+"}")
+        self.Coefficients.setFont(space_grotesk)
+        self.Coefficients.setObjectName("Coefficients")
+        self.gridLayout = QtWidgets.QGridLayout(self.Coefficients)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setHorizontalSpacing(10)
+        self.gridLayout.setVerticalSpacing(8)
+        self.gridLayout.setObjectName("gridLayout")
+        self.K1Label = QtWidgets.QLabel(self.Coefficients)
+        self.K1Label.setObjectName("K1Label")
+        self.gridLayout.addWidget(self.K1Label, 0, 0, 1, 1)
+        self.K1SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.K1SpinBox.setDecimals(4)
+        self.K1SpinBox.setMinimum(-2.0)
+        self.K1SpinBox.setMaximum(2.0)
+        self.K1SpinBox.setSingleStep(0.01)
+        self.K1SpinBox.setObjectName("K1SpinBox")
+        self.gridLayout.addWidget(self.K1SpinBox, 0, 1, 1, 1)
+        self.K2Label = QtWidgets.QLabel(self.Coefficients)
+        self.K2Label.setObjectName("K2Label")
+        self.gridLayout.addWidget(self.K2Label, 0, 2, 1, 1)
+        self.K2SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.K2SpinBox.setDecimals(4)
+        self.K2SpinBox.setMinimum(-2.0)
+        self.K2SpinBox.setMaximum(2.0)
+        self.K2SpinBox.setSingleStep(0.01)
+        self.K2SpinBox.setObjectName("K2SpinBox")
+        self.gridLayout.addWidget(self.K2SpinBox, 0, 3, 1, 1)
+        self.K3Label = QtWidgets.QLabel(self.Coefficients)
+        self.K3Label.setObjectName("K3Label")
+        self.gridLayout.addWidget(self.K3Label, 1, 0, 1, 1)
+        self.K3SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.K3SpinBox.setDecimals(4)
+        self.K3SpinBox.setMinimum(-2.0)
+        self.K3SpinBox.setMaximum(2.0)
+        self.K3SpinBox.setSingleStep(0.01)
+        self.K3SpinBox.setObjectName("K3SpinBox")
+        self.gridLayout.addWidget(self.K3SpinBox, 1, 1, 1, 1)
+        self.P1Label = QtWidgets.QLabel(self.Coefficients)
+        self.P1Label.setObjectName("P1Label")
+        self.gridLayout.addWidget(self.P1Label, 1, 2, 1, 1)
+        self.P1SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.P1SpinBox.setDecimals(4)
+        self.P1SpinBox.setMinimum(-2.0)
+        self.P1SpinBox.setMaximum(2.0)
+        self.P1SpinBox.setSingleStep(0.01)
+        self.P1SpinBox.setObjectName("P1SpinBox")
+        self.gridLayout.addWidget(self.P1SpinBox, 1, 3, 1, 1)
+        self.P2Label = QtWidgets.QLabel(self.Coefficients)
+        self.P2Label.setObjectName("P2Label")
+        self.gridLayout.addWidget(self.P2Label, 2, 0, 1, 1)
+        self.P2SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.P2SpinBox.setDecimals(4)
+        self.P2SpinBox.setMinimum(-2.0)
+        self.P2SpinBox.setMaximum(2.0)
+        self.P2SpinBox.setSingleStep(0.01)
+        self.P2SpinBox.setObjectName("P2SpinBox")
+        self.gridLayout.addWidget(self.P2SpinBox, 2, 1, 1, 1)
+        self.K4Label = QtWidgets.QLabel(self.Coefficients)
+        self.K4Label.setObjectName("K4Label")
+        self.gridLayout.addWidget(self.K4Label, 2, 2, 1, 1)
+        self.K4SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.K4SpinBox.setDecimals(4)
+        self.K4SpinBox.setMinimum(-2.0)
+        self.K4SpinBox.setMaximum(2.0)
+        self.K4SpinBox.setSingleStep(0.01)
+        self.K4SpinBox.setObjectName("K4SpinBox")
+        self.gridLayout.addWidget(self.K4SpinBox, 2, 3, 1, 1)
+        self.K5Label = QtWidgets.QLabel(self.Coefficients)
+        self.K5Label.setObjectName("K5Label")
+        self.gridLayout.addWidget(self.K5Label, 3, 0, 1, 1)
+        self.K5SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.K5SpinBox.setDecimals(4)
+        self.K5SpinBox.setMinimum(-2.0)
+        self.K5SpinBox.setMaximum(2.0)
+        self.K5SpinBox.setSingleStep(0.01)
+        self.K5SpinBox.setObjectName("K5SpinBox")
+        self.gridLayout.addWidget(self.K5SpinBox, 3, 1, 1, 1)
+        self.K6Label = QtWidgets.QLabel(self.Coefficients)
+        self.K6Label.setObjectName("K6Label")
+        self.gridLayout.addWidget(self.K6Label, 3, 2, 1, 1)
+        self.K6SpinBox = QtWidgets.QDoubleSpinBox(self.Coefficients)
+        self.K6SpinBox.setDecimals(4)
+        self.K6SpinBox.setMinimum(-2.0)
+        self.K6SpinBox.setMaximum(2.0)
+        self.K6SpinBox.setSingleStep(0.01)
+        self.K6SpinBox.setObjectName("K6SpinBox")
+        self.gridLayout.addWidget(self.K6SpinBox, 3, 3, 1, 1)
+        self.verticalLayout_3.addWidget(self.Coefficients)
         self.Intensity = QtWidgets.QWidget(self.Parameters)
         self.Intensity.setEnabled(True)
         self.Intensity.setObjectName("Intensity")
@@ -257,6 +393,8 @@ class Ui_MainWindow(object):
         self.verticalLayout_6.addWidget(self.CenterYSliderPart)
         self.verticalLayout_3.addWidget(self.CenterY)
         self.DistortionTypeRadios.raise_()
+        self.Preset.raise_()
+        self.Coefficients.raise_()
         self.Intensity.raise_()
         self.CenterX.raise_()
         self.CenterY.raise_()
@@ -415,6 +553,24 @@ class Ui_MainWindow(object):
         self.Barrel.setText(_translate("MainWindow", "Barrel"))
         self.Pinpoint.setText(_translate("MainWindow", "Pincushion"))
         self.Nonee.setText(_translate("MainWindow", "None"))
+        self.PresetLabel.setText(_translate("MainWindow", "Preset"))
+        self.PresetDropDown.setItemText(0, _translate("MainWindow", "None"))
+        self.PresetDropDown.setItemText(1, _translate("MainWindow", "Barrel"))
+        self.PresetDropDown.setItemText(2, _translate("MainWindow", "Pincushion"))
+        self.PresetDropDown.setItemText(3, _translate("MainWindow", "Mustache"))
+        self.PresetDropDown.setItemText(4, _translate("MainWindow", "Wide Angle"))
+        self.PresetDropDown.setItemText(5, _translate("MainWindow", "Telephoto"))
+        self.PresetDropDown.setItemText(6, _translate("MainWindow", "Decentered"))
+        self.PresetDropDown.setItemText(7, _translate("MainWindow", "Fisheye"))
+        self.PresetDropDown.setItemText(8, _translate("MainWindow", "Custom"))
+        self.K1Label.setText(_translate("MainWindow", "k1"))
+        self.K2Label.setText(_translate("MainWindow", "k2"))
+        self.K3Label.setText(_translate("MainWindow", "k3"))
+        self.P1Label.setText(_translate("MainWindow", "p1"))
+        self.P2Label.setText(_translate("MainWindow", "p2"))
+        self.K4Label.setText(_translate("MainWindow", "k4"))
+        self.K5Label.setText(_translate("MainWindow", "k5"))
+        self.K6Label.setText(_translate("MainWindow", "k6"))
         self.IntensityLabel.setText(_translate("MainWindow", "Intensity"))
         self.IntensityNumber.setText(_translate("MainWindow", "0"))
         self.CenterXLabel.setText(_translate("MainWindow", "Center X"))
@@ -1,6 +1,6 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 from distortion_presets_and_customization import Ui_MainWindow as Ui_DistortionPresetsAndCustomization
-import numpy as np
+from distortion_engine import DistortionEngine, COEFFICIENTS
 import cv2
 
 class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
@@ -8,6 +8,8 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
         super().__init__(parent)
         self.ui = Ui_DistortionPresetsAndCustomization()
         self.ui.setupUi(self)
+        self.engine = DistortionEngine()
+        self.coefficient_boxes = {k: getattr(self.ui, f'{k.upper()}SpinBox') for k in COEFFICIENTS}
         self.reset()
         self.connect_signals()
         self.selection = 'None'
@@ -29,7 +31,7 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
             self.ui.OriginalDefault.setScaledContents(False)
             self.ui.SimulatedDefault.setScaledContents(False)
             
-            img_data = cv2.imread(img)
+            img_data = self.parent().image_store.get(img)
             h, w = img_data.shape[:2]
             self.ui.CenterXSlider.setRange(0, w)
             self.ui.CenterYSlider.setRange(0, h)
@@ -49,6 +51,8 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
         self.ui.IntensityNumber.setText(_translate("MainWindow", "0"))
         self.ui.CenterXNumber.setText(_translate("MainWindow", "0"))
         self.ui.CenterYNumber.setText(_translate("MainWindow", "0"))
+        self.ui.PresetDropDown.setCurrentText('None')
+        self.show_coefficients(self.engine.coefficients('None', 0))
 
     def connect_signals(self):
         self.ui.Barrel.clicked.connect(self.selection_changed)
@@ -60,10 +64,53 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
         self.ui.CenterXSlider.sliderReleased.connect(self.update_distortion)
         self.ui.CenterYSlider.valueChanged.connect(self.update_centery)
         self.ui.CenterYSlider.sliderReleased.connect(self.update_distortion)
+        self.ui.PresetDropDown.currentTextChanged.connect(self.preset_changed)
+        for box in self.coefficient_boxes.values():
+            box.valueChanged.connect(self.coefficient_edited)
 
     def update_intensity(self):
         val = self.ui.IntensitySlider.value()
         self.ui.IntensityNumber.setText(f'{val / 1000.0}')
+        if self.selection != 'Custom':
+            self.show_coefficients(self.engine.coefficients(self.selection, val))
+
+    def show_coefficients(self, coefficients):
+        for k, box in self.coefficient_boxes.items():
+            box.blockSignals(True)
+            box.setValue(coefficients[k])
+            box.blockSignals(False)
+
+    def get_coefficients(self):
+        if self.selection == 'Custom':
+            return self.engine.coefficients('Custom', 0, {k: box.value() for k, box in self.coefficient_boxes.items()})
+        return self.engine.coefficients(self.selection, self.ui.IntensitySlider.value())
+
+    def show_preset_radio(self, preset):
+        # Mirrors the dropdown in the radio group; presets without a radio clear it.
+        radios = {'Barrel': self.ui.Barrel, 'Pincushion': self.ui.Pinpoint, 'None': self.ui.Nonee}
+        for name, radio in radios.items():
+            radio.blockSignals(True)
+            radio.setAutoExclusive(False)
+            radio.setChecked(name == preset)
+            radio.setAutoExclusive(True)
+            radio.blockSignals(False)
+
+    def preset_changed(self, preset):
+        self.selection = preset
+        self.show_preset_radio(preset)
+        if preset != 'Custom':
+            self.show_coefficients(self.engine.coefficients(preset, self.ui.IntensitySlider.value()))
+        self.update_distortion()
+
+    def coefficient_edited(self):
+        # Editing a coefficient turns the current preset into a custom lens.
+        if self.selection != 'Custom':
+            self.ui.PresetDropDown.blockSignals(True)
+            self.ui.PresetDropDown.setCurrentText('Custom')
+            self.ui.PresetDropDown.blockSignals(False)
+            self.show_preset_radio('Custom')
+            self.selection = 'Custom'
+        self.update_distortion()
 
     def update_centerx(self):
         cx = self.ui.CenterXSlider.value()
@@ -76,7 +123,7 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
     def update_distortion(self):
         if not self.img:
             return
-        img = cv2.imread(self.img)
+        img = self.parent().image_store.get(self.img)
         h, w = img.shape[:2]
         value = self.ui.IntensitySlider.value()
         cx = self.ui.CenterXSlider.value()
@@ -85,28 +132,17 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
         self.ui.CenterXNumber.setText(f'{cx}')
         self.ui.CenterYNumber.setText(f'{cy}')
         
-        if self.selection == 'None':
+        coefficients = self.get_coefficients()
+        if not any(coefficients.values()):
             pixmap = QtGui.QPixmap(self.img)
             label_size = self.ui.OriginalDefault.size()
             pixmap = pixmap.scaled(label_size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
             self.ui.SimulatedDefault.setPixmap(pixmap)
             return
-        elif self.selection == 'Barrel':
-            k1 = value / 1000.0
-        else:
-            k1 = -value / 1000.0
 
-        map_x, map_y = np.meshgrid(np.arange(w), np.arange(h))
-        dx, dy = map_x - cx, map_y - cy
-        r_sq = dx**2 + dy**2
-        norm_denom = (w/2)**2 + (h/2)**2
-        if norm_denom == 0: 
-            norm_denom = 1
-        r_sq_norm = r_sq / norm_denom
-        radial = 1 + k1 * r_sq_norm
-        map_x = cx + dx * radial
-        map_y = cy + dy * radial
-        distorted = cv2.remap(img, map_x.astype(np.float32), map_y.astype(np.float32), cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        profiler = self.parent().profiler
+        map1, map2 = profiler.measure('distortion.maps', self.engine.maps, w, h, coefficients, cx, cy)
+        distorted = profiler.measure('distortion.remap', cv2.remap, img, map1, map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
         distorted_rgb = cv2.cvtColor(distorted, cv2.COLOR_BGR2RGB)
         h, w, ch = distorted_rgb.shape
         bytes_per_line = ch * w
@@ -118,8 +154,8 @@ class DistortionPresetsAndCustomizationLogic(QtWidgets.QMainWindow):
 
     def selection_changed(self):
         if self.ui.Barrel.isChecked():
-            self.selection = 'Barrel'
+            self.ui.PresetDropDown.setCurrentText('Barrel')
         elif self.ui.Pinpoint.isChecked():
-            self.selection = 'Pinpoint'
+            self.ui.PresetDropDown.setCurrentText('Pincushion')
         else:
-            self.selection = 'None'
\ No newline at end of file
+            self.ui.PresetDropDown.setCurrentText('None')
\ No newline at end of file
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import cv2
+import numpy as np
+
+# cv2.AKAZE_create arguments; part of every cache key, so changing one
+# never returns features computed with another.
+AKAZE_SETTINGS = {
+    'descriptor_type': cv2.AKAZE_DESCRIPTOR_MLDB,
+    'descriptor_size': 0,
+    'descriptor_channels': 3,
+    'threshold': 0.001,
+    'nOctaves': 4,
+    'nOctaveLayers': 4,
+    'diffusivity': cv2.KAZE_DIFF_PM_G2
+}
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'image-simulator', 'features')
+
+def create_detector(settings=AKAZE_SETTINGS):
+    return cv2.AKAZE_create(**settings)
+
+def _keypoints_to_array(keypoints):
+    return np.array([(k.pt[0], k.pt[1], k.size, k.angle, k.response, k.octave, k.class_id) for k in keypoints],
+                    dtype=np.float64).reshape(-1, 7)
+
+def _array_to_keypoints(array):
+    return tuple(cv2.KeyPoint(x, y, size, angle, response, int(octave), int(class_id))
+                 for x, y, size, angle, response, octave, class_id in array)
+
+class FeatureCache:
+    """
+    Keypoints and descriptors per image, kept in memory (LRU, max_entries)
+    and as .npz files in directory (None keeps them in memory only). The
+    directory is pruned to max_disk_bytes after each write, oldest
+    modification time first; disk hits refresh an entry's time. Keys
+    hash the pixel data, shape and dtype together with the detector settings
+    and the OpenCV version, so a file path, a decoded copy and a re-saved
+    copy of the same reference all share one entry. Disk writes go through
+    a temporary file and os.replace, so pool workers can share a directory.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_entries=16, max_disk_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(img, settings=AKAZE_SETTINGS):
+        h = hashlib.sha1()
+        h.update(repr((img.shape, img.dtype.str, sorted(settings.items()), cv2.__version__)).encode())
+        h.update(np.ascontiguousarray(img).data)
+        return h.hexdigest()
+
+    def detect(self, img, settings=AKAZE_SETTINGS):
+        """(keypoints, descriptors) of img, computing them only on a miss."""
+        key = self.key(img, settings)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load(key)
+        if entry is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            entry = create_detector(settings).detectAndCompute(img, None)
+            self._save(key, entry)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                descriptors = data['descriptors'] if data['has_descriptors'] else None
+                entry = _array_to_keypoints(data['keypoints']), descriptors
+            os.utime(self._path(key))
+            return entry
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, key, entry):
+        if self.directory is None:
+            return
+        keypoints, descriptors = entry
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix='.npz', dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, keypoints=_keypoints_to_array(keypoints), has_descriptors=descriptors is not None,
+                         descriptors=descriptors if descriptors is not None else np.empty((0, 0), np.uint8))
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"Could not write feature cache entry: {e}")
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.prune()
+
+    def _disk_entries(self):
+        """(mtime, size, path) of every cache file, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # Removed by another process meanwhile.
+            entries.append((st.st_mtime, st.st_size, path))
+        return sorted(entries)
+
+    def prune(self, max_bytes=None):
+        """Deletes the least recently used files until the directory holds at most max_bytes."""
+        if self.directory is None:
+            return
+        max_bytes = self.max_disk_bytes if max_bytes is None else max_bytes
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def stats(self):
+        disk_bytes = sum(size for _, size, _ in self._disk_entries()) if self.directory is not None else 0
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'disk_hits': self.disk_hits,
+                    'misses': self.misses, 'directory': self.directory, 'disk_bytes': disk_bytes}
+
+    def clear(self, disk=False):
+        """Empties the memory cache, and with disk=True the cache directory too."""
+        with self._lock:
+            self._entries.clear()
+        if disk:
+            self.prune(0)
+
+# Shared by every TuningThread, including batch workers (through the disk).
+FEATURE_CACHE = FeatureCache()
@@ -0,0 +1,255 @@
+"""
+Synthetic dataset generator.
+
+Renders N randomised variants of every source image across all CPU cores
+and streams a JSONL manifest with the exact parameters and seed of each
+sample, so any sample can be reproduced and used as ground truth.
+
+    python generate_dataset.py captures/ spec.json dataset/ --workers 8
+    python generate_dataset.py "captures/*.png" spec.json dataset/ --resume
+
+The spec has the same layout as a batch_render.py parameter file, but any
+value can be a distribution:
+
+    {"samples_per_source": 20, "seed": 1234,
+     "params": {
+        "zoom": {"uniform": [0, 40]},
+        "fov": {"normal": [60, 10], "clip": [30, 120]},
+        "distortion": {"randint": [-200, 200]},
+        "brightness": {"uniform": [-30, 30]},
+        "ld": {"randint": [0, 359]},
+        "noise": {"choice": [0, 2, 5, 10]},
+        "exposure": {"sweep": [30, 50, 70]},
+        "resolution": "1280 x 720",
+        "sensor": {"sensor_type": {"choice": ["CMOS", "CCD", "sCMOS"]},
+                   "noise_level": {"uniform": [0, 8]}}}}
+
+uniform/normal draw floats, randint draws integers (inclusive), choice picks
+one item, and clip bounds any numeric draw. sweep values are not sampled:
+every source gets samples_per_source variants for each combination of sweep
+values. Anything else (numbers, strings, lists) is used as-is.
+
+A source's name is its path below the input folder (or the glob matches'
+common folder) without the extension, e.g. "day/x" for day/x.png; samples
+are written as images/<name>_<variant>. Sample i of a source is seeded from
+(seed, crc32(name), i), so the output does not depend on the number of
+workers, the order samples finish in, or which other sources are in the
+run. Sources whose names clash (x.png and x.jpg) are refused.
+"""
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+import zlib
+import numpy as np
+import cv2
+import noise
+from map_cache import MAP_CACHE
+from batch_render import bounded_imap, collect_inputs, find_collisions, input_root, render_image
+from image_store import ImageStore
+from simulation_engine import SimulationEngine
+from sensor_engine import SensorEngine
+from distortion_engine import DistortionEngine
+
+DISTRIBUTIONS = ('uniform', 'normal', 'randint', 'choice')
+
+_worker = {}
+
+def _init_worker(spec, output_dir, ext, fixed_point=True):
+    cv2.setNumThreads(1)
+    noise.set_threads(1)
+    MAP_CACHE.fixed_point = fixed_point
+    _worker['spec'] = spec
+    _worker['output_dir'] = output_dir
+    _worker['ext'] = ext
+    # Jobs arrive grouped by source, so a small store avoids re-decoding.
+    _worker['images'] = ImageStore(max_entries=2)
+    _worker['simulation'] = SimulationEngine(memoize=False)
+    _worker['distortion'] = DistortionEngine()
+    _worker['sensor'] = SensorEngine()
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def sample_value(spec, rng):
+    """Draws one concrete value from a spec entry (see the module docstring)."""
+    if isinstance(spec, dict):
+        kind = next((k for k in DISTRIBUTIONS if k in spec), None)
+        if kind is None:
+            return {k: sample_value(v, rng) for k, v in spec.items()}
+        args = spec[kind]
+        if kind == 'uniform':
+            value = rng.uniform(*args)
+        elif kind == 'normal':
+            value = rng.normal(*args)
+        elif kind == 'randint':
+            value = rng.integers(args[0], args[1], endpoint=True)
+        else:
+            value = args[rng.integers(len(args))]
+        if 'clip' in spec:
+            value = min(max(value, spec['clip'][0]), spec['clip'][1])
+        return _to_builtin(value)
+    return spec
+
+def sweep_axes(spec, path=()):
+    """Returns [(key path, values)] for every sweep entry in the spec."""
+    axes = []
+    for key, value in spec.items():
+        if isinstance(value, dict):
+            if 'sweep' in value:
+                axes.append((path + (key,), value['sweep']))
+            elif not any(k in value for k in DISTRIBUTIONS):
+                axes.extend(sweep_axes(value, path + (key,)))
+    return axes
+
+def _set_path(params, path, value):
+    for key in path[:-1]:
+        params = params[key]
+    params[path[-1]] = value
+
+def sample_params(spec, sweep_point, rng):
+    """Draws a full parameter set, with sweep entries fixed to sweep_point."""
+    params = sample_value(spec, rng)
+    for path, value in sweep_point:
+        _set_path(params, path, value)
+    return params
+
+def source_name(src, root):
+    """src's path below root without the extension, with '/' separators on every platform."""
+    rel = os.path.relpath(os.path.abspath(src), os.path.abspath(root))
+    return os.path.splitext(rel)[0].replace(os.sep, '/')
+
+def sample_seed(seed, name, variant):
+    entropy = [seed, zlib.crc32(name.encode('utf-8')), variant]
+    return int(np.random.SeedSequence(entropy).generate_state(1)[0])
+
+def iter_jobs(sources, spec, done_ids):
+    """
+    Lazily yields one job per sample so the job list never sits in memory.
+    sources are (path, source_name) pairs.
+    """
+    axes = sweep_axes(spec['params'])
+    grid = list(itertools.product(*[values for _, values in axes]))
+    n = spec.get('samples_per_source', 1)
+    for src, name in sources:
+        variant = 0
+        for point in grid:
+            sweep_point = [(path, value) for (path, _), value in zip(axes, point)]
+            for _ in range(n):
+                sample_id = f'{name}_{variant:05d}'
+                if sample_id not in done_ids:
+                    yield (sample_id, src, name, variant, sweep_point)
+                variant += 1
+
+def _render_sample(sample_id, src, name, variant, sweep_point):
+    spec = _worker['spec']
+    img = _worker['images'].get(src)
+    if img is None:
+        return {'id': sample_id, 'source': src, 'error': "could not be read"}
+
+    seed = sample_seed(spec.get('seed', 0), name, variant)
+    rng = np.random.default_rng(seed)
+    params = sample_params(spec['params'], sweep_point, rng)
+    result = render_image(img, params, _worker['simulation'], _worker['distortion'], _worker['sensor'], rng)
+
+    output = os.path.join(_worker['output_dir'], sample_id + _worker['ext'])
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if not cv2.imwrite(output, result):
+        return {'id': sample_id, 'source': src, 'error': "could not be written"}
+    h, w = result.shape[:2]
+    return {
+        'id': sample_id,
+        'source': src,
+        'output': os.path.relpath(output, os.path.dirname(_worker['output_dir'])),
+        'variant': variant,
+        'seed': seed,
+        'size': [w, h],
+        'params': params
+    }
+
+def read_done_ids(manifest_path):
+    done = set()
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    done.add(json.loads(line)['id'])
+    return done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset with a ground-truth manifest.")
+    parser.add_argument('input', help="Source image folder or glob pattern.")
+    parser.add_argument('spec', help="JSON dataset spec.")
+    parser.add_argument('output', help="Dataset folder (images/ and manifest.jsonl are written inside).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help="Samples queued or rendering at once (default: 2 x workers). Bounds memory use.")
+    parser.add_argument('--float-maps', action='store_true',
+                        help="Use float32 remap maps instead of fixed-point ones (slower, full sub-pixel precision).")
+    parser.add_argument('--ext', default='.png', help="Output image extension.")
+    parser.add_argument('--resume', action='store_true',
+                        help="Append to an existing manifest, skipping samples it already lists.")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    spec.setdefault('params', {})
+    inputs = collect_inputs(args.input)
+    root = input_root(args.input, inputs)
+    sources = [(src, source_name(src, root)) for src in inputs]
+    collisions = find_collisions(sources)
+    if collisions:
+        # Clashing names would share sample ids, seeds and output files.
+        print(f"{len(collisions)} source names are used by more than one input:")
+        for name, srcs in sorted(collisions.items()):
+            print(f"  {os.path.relpath(name)}: {', '.join(srcs)}")
+        print("Rename the inputs so each name (path without extension) is unique.")
+        return 2
+
+    image_dir = os.path.join(args.output, 'images')
+    os.makedirs(image_dir, exist_ok=True)
+    manifest_path = os.path.join(args.output, 'manifest.jsonl')
+    if not args.resume and os.path.exists(manifest_path):
+        print(f"{manifest_path} already exists; use --resume to continue it.")
+        return 1
+    done_ids = read_done_ids(manifest_path) if args.resume else set()
+
+    axes = sweep_axes(spec['params'])
+    per_source = spec.get('samples_per_source', 1) * int(np.prod([len(values) for _, values in axes]))
+    # Counted job by job: the manifest may list samples that are no longer in the run.
+    total = sum(1 for _ in iter_jobs(sources, spec, done_ids))
+    print(f"{len(sources)} sources x {per_source} variants, {len(done_ids)} already generated, "
+          f"{total} to render with {args.workers} workers.")
+    if total <= 0:
+        return 0
+
+    max_in_flight = args.max_in_flight or 2 * args.workers
+    failures = 0
+    start = time.perf_counter()
+    with open(manifest_path, 'a') as manifest, concurrent.futures.ProcessPoolExecutor(
+            max_workers=args.workers, initializer=_init_worker, initargs=(spec, image_dir, args.ext, not args.float_maps)) as executor:
+        jobs = iter_jobs(sources, spec, done_ids)
+        for done, record in enumerate(bounded_imap(executor, _render_sample, jobs, max_in_flight), 1):
+            if 'error' in record:
+                failures += 1
+                print(f"  {record['id']}: {record['error']}")
+            else:
+                manifest.write(json.dumps(record) + '\n')
+            if done % 100 == 0 or done == total:
+                manifest.flush()
+                elapsed = time.perf_counter() - start
+                print(f"  {done}/{total} generated, {done / elapsed:.2f} samples/s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {total - failures} samples, {failures} failed in {elapsed:.1f} s "
+          f"({total / elapsed:.2f} samples/s). Manifest: {manifest_path}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
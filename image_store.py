@@ -0,0 +1,51 @@
+from collections import OrderedDict
+import os
+import threading
+import cv2
+
+class ImageStore:
+    """
+    Decoded-image cache shared by every page. Images are keyed by absolute
+    path and read flags, and are re-decoded only when the file's mtime
+    changes. With read_only set the returned arrays are not writeable, so
+    a stage that accidentally modifies its input fails loudly instead of
+    corrupting the cached copy.
+    """
+
+    def __init__(self, max_entries=8, read_only=True):
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, flags=cv2.IMREAD_COLOR):
+        if not path:
+            return None
+        key = (os.path.abspath(path), flags)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        img = cv2.imread(path, flags)
+        if img is None:
+            return None
+        if self.read_only:
+            img.flags.writeable = False
+
+        with self._lock:
+            self._entries[key] = (mtime, img)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
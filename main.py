@@ -1,10 +1,16 @@
 import sys
-from PyQt5 import QtCore, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
 from simulator_control_panel_logic import SimulatorControlPanelLogic
 from sensor_and_noise_parameter_logic import SensorAndNoiseParameterLogic
 from distortion_presets_and_customization_logic import DistortionPresetsAndCustomizationLogic
 from comparison_and_metrics_display_logic import ComparisonAndMetricsDisplayLogic
 from autotuning_and_calibration_logic import AutotuningAndCalibrationLogic
+from simulation_engine import DEFAULT_PARAMS
+from image_store import ImageStore
+from map_cache import MAP_CACHE
+from sensor_engine import FIXED_PATTERN_CACHE
+from profiler import PROFILER
+from performance_hud import PerformanceHud
 
 MENU_WIDTH = 250
 
@@ -41,20 +47,18 @@ class AppWindow(QtWidgets.QMainWindow):
         self.menu_animation.setEasingCurve(QtCore.QEasingCurve.InOutCubic)
         self.menu_frame.raise_()
 
+        self.image_store = ImageStore()
+        self.profiler = PROFILER
+        self.performance_hud = PerformanceHud(self.profiler, self)
+        QtWidgets.QShortcut(QtGui.QKeySequence("F3"), self, activated=self.performance_hud.toggle)
+        QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+Shift+E"), self, activated=self.export_profile)
+        QtWidgets.QShortcut(QtGui.QKeySequence("F4"), self, activated=self.toggle_map_precision)
+        QtWidgets.QShortcut(QtGui.QKeySequence("F5"), self, activated=self.toggle_allocation_tracking)
         self.img = None
         self.sim = None
         self.img_display_size = None
         self.autotuned_params = None
-        self.current_params = {
-            'zoom': 0,
-            'fov': 60,
-            'distortion': 0,
-            'brightness': 0,
-            'ld': 45,
-            'shadows': 0,
-            'noise': 0,
-            'exposure': 50
-        }
+        self.current_params = dict(DEFAULT_PARAMS)
 
         self._switch_ui(SimulatorControlPanelLogic)
 
@@ -100,6 +104,8 @@ class AppWindow(QtWidgets.QMainWindow):
             self.toggle_menu()
 
     def _switch_ui(self, logic_class):
+        if hasattr(self.current_controller, 'close_page'):
+            self.current_controller.close_page()
         if hasattr(logic_class, "__init__") and "img" in logic_class.__init__.__code__.co_varnames:
             self.current_controller = logic_class(self, img=self.img, img_size=self.img_display_size)
         elif hasattr(logic_class, "__init__") and "sim" in logic_class.__init__.__code__.co_varnames:
@@ -119,6 +125,26 @@ class AppWindow(QtWidgets.QMainWindow):
             menu_button.clicked.connect(self.toggle_menu)
         
         self.centralWidget().installEventFilter(self)
+        if self.performance_hud.isVisible():
+            self.performance_hud.raise_()
+
+    def export_profile(self):
+        file_name, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Performance Profile", "profile.json", "JSON (*.json)")
+        if file_name:
+            self.profiler.to_json(file_name, extra={'map_cache': MAP_CACHE.stats(), 'fixed_pattern_cache': FIXED_PATTERN_CACHE.stats(),
+                                                    'track_allocations': self.profiler.track_allocations})
+            print(f"Performance profile written to {file_name}")
+
+    def toggle_map_precision(self):
+        # Fixed-point maps are the default; float maps trade speed and memory for sub-pixel precision.
+        MAP_CACHE.fixed_point = not MAP_CACHE.fixed_point
+        MAP_CACHE.clear()
+        print(f"Remap maps: {'fixed-point' if MAP_CACHE.fixed_point else 'float32'}")
+
+    def toggle_allocation_tracking(self):
+        # tracemalloc peaks include every temporary, but slow rendering down noticeably.
+        self.profiler.set_track_allocations(not self.profiler.track_allocations)
+        print(f"Allocation tracking: {'on' if self.profiler.track_allocations else 'off'}")
 
     def eventFilter(self, source, event):
         if self.menu_frame.x() == 0 and event.type() == QtCore.QEvent.MouseButtonPress:
@@ -138,6 +164,11 @@ class AppWindow(QtWidgets.QMainWindow):
         self.menu_animation.setEndValue(end_pos)
         self.menu_animation.start()
 
+    def closeEvent(self, event):
+        if hasattr(self.current_controller, 'close_page'):
+            self.current_controller.close_page()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.menu_frame.raise_()
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+import threading
+import cv2
+
+class MapCache:
+    """
+    Bounded LRU cache for ready-to-use cv2.remap coordinate maps.
+    Entries are evicted least-recently-used first once the stored maps
+    exceed max_bytes. Cached arrays are marked read-only since they are
+    shared between every caller with the same key.
+
+    With fixed_point on, remap_maps stores OpenCV's CV_16SC2 + CV_16UC1
+    representation (6 bytes per pixel instead of 8, and no per-call
+    conversion inside cv2.remap); turn it off to keep float32 maps.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, fixed_point=True):
+        self.max_bytes = max_bytes
+        self.fixed_point = fixed_point
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the maps stored under key, calling build() on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        maps = build()
+        for m in maps:
+            m.flags.writeable = False
+        size = sum(m.nbytes for m in maps)
+        if size > self.max_bytes:
+            return maps
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (maps, size)
+                self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return maps
+
+    def remap_maps(self, key, build):
+        """
+        Return (map1, map2) ready for cv2.remap, where build() makes float32
+        (map_x, map_y). The float maps are only kept when fixed_point is off.
+        """
+        if not self.fixed_point:
+            return self.get(key, build)
+        return self.get(key + ('fixed',), lambda: cv2.convertMaps(*build(), cv2.CV_16SC2))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'fixed_point': self.fixed_point,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+# Shared by every page and engine in the process so identical optics
+# settings only ever build their maps once.
+MAP_CACHE = MapCache()
@@ -0,0 +1,20 @@
+import cv2
+from skimage.metrics import structural_similarity as ssim
+from skimage.metrics import peak_signal_noise_ratio as psnr
+
+def comparison_grays(real_bgr, sim_rgb):
+    """Resize the real capture to the simulated frame and return both as grayscale."""
+    h, w = sim_rgb.shape[:2]
+    real_resized_bgr = cv2.resize(real_bgr, (w, h), interpolation=cv2.INTER_AREA)
+    real_gray = cv2.cvtColor(real_resized_bgr, cv2.COLOR_BGR2GRAY)
+    sim_gray = cv2.cvtColor(sim_rgb, cv2.COLOR_RGB2GRAY)
+    return real_gray, sim_gray
+
+def _data_range(sim_gray):
+    return sim_gray.max() - sim_gray.min()
+
+def compute_ssim(real_gray, sim_gray):
+    return ssim(real_gray, sim_gray, data_range=_data_range(sim_gray))
+
+def compute_psnr(real_gray, sim_gray):
+    return psnr(real_gray, sim_gray, data_range=_data_range(sim_gray))
@@ -0,0 +1,56 @@
+from PyQt5 import QtWidgets, QtCore, QtGui
+from map_cache import MAP_CACHE
+from sensor_engine import FIXED_PATTERN_CACHE
+
+class PerformanceHud(QtWidgets.QLabel):
+    """Translucent overlay listing per-stage timings from a StageProfiler."""
+
+    def __init__(self, profiler, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.setStyleSheet("""
+            QLabel {
+                color: #e5e7eb;
+                background-color: rgba(15, 27, 35, 210);
+                border: 1px solid #1e293b;
+                border-radius: 6px;
+                padding: 8px;
+            }
+        """)
+        self.setFont(QtGui.QFont("Consolas", 9))
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(QtCore.Qt.PlainText)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.timer.start()
+
+    def refresh(self):
+        tracking = self.profiler.track_allocations
+        lines = [f"{'stage':<28}{'calls':>6}{'last ms':>10}{'mean ms':>10}{'MB':>8}" + (f"{'peak MB':>9}" if tracking else "")]
+        for name, s in sorted(self.profiler.snapshot().items()):
+            line = f"{name:<28}{s['calls']:>6}{s['last_s'] * 1000:>10.1f}{s['mean_s'] * 1000:>10.1f}{s['last_bytes'] / 1e6:>8.1f}"
+            lines.append(line + (f"{s['peak_bytes'] / 1e6:>9.1f}" if tracking else ""))
+        cache = MAP_CACHE.stats()
+        lines.append("")
+        lines.append(f"map cache: {cache['entries']} maps, {cache['bytes'] / 1e6:.0f} MB, "
+                     f"{cache['hits']} hits / {cache['misses']} misses, "
+                     f"{'fixed-point' if cache['fixed_point'] else 'float32'} (F4)")
+        fpn = FIXED_PATTERN_CACHE.stats()
+        lines.append(f"fixed pattern: {fpn['entries']} sensors, {fpn['bytes'] / 1e6:.0f} MB")
+        lines.append(f"allocation tracking: {'on' if tracking else 'off'} (F5)")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(parent.width() - self.width() - 16, 16)
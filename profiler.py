@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+import json
+import threading
+import time
+import tracemalloc
+import numpy as np
+
+def _nbytes(result):
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, (tuple, list)):
+        return sum(_nbytes(r) for r in result)
+    return 0
+
+class StageProfiler:
+    """
+    Collects wall-clock time and allocation counts per named pipeline stage.
+    Every stage records the bytes of the arrays it returns. If
+    track_allocations is on, it also records the tracemalloc peak while it
+    ran, which covers temporaries too but slows rendering down.
+    """
+
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, nbytes=0, peak_bytes=0):
+        with self._lock:
+            s = self._stats.get(name)
+            if s is None:
+                s = self._stats[name] = {
+                    'calls': 0, 'total_s': 0.0, 'last_s': 0.0, 'max_s': 0.0,
+                    'last_bytes': 0, 'total_bytes': 0, 'peak_bytes': 0
+                }
+            s['calls'] += 1
+            s['total_s'] += seconds
+            s['last_s'] = seconds
+            s['max_s'] = max(s['max_s'], seconds)
+            s['last_bytes'] = nbytes
+            s['total_bytes'] += nbytes
+            s['peak_bytes'] = max(s['peak_bytes'], peak_bytes)
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block. Output bytes are not known here, so only time (and peak) are recorded."""
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - base if tracing else 0
+            self.record(name, elapsed, 0, peak)
+
+    def measure(self, name, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs), recording its time and the size of what it returns."""
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - base if tracing else 0
+        # A stage that hands its input straight back allocated nothing.
+        nbytes = 0 if any(result is a for a in args) else _nbytes(result)
+        self.record(name, elapsed, nbytes, peak)
+        return result
+
+    def set_track_allocations(self, enabled):
+        self.track_allocations = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def snapshot(self):
+        with self._lock:
+            out = {}
+            for name, s in self._stats.items():
+                entry = dict(s)
+                entry['mean_s'] = s['total_s'] / s['calls'] if s['calls'] else 0.0
+                out[name] = entry
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self, path, extra=None):
+        data = {'stages': self.snapshot()}
+        if extra:
+            data.update(extra)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+# Shared by the GUI pages and their render workers.
+PROFILER = StageProfiler()
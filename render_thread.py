@@ -0,0 +1,76 @@
+# render_thread.py
+import threading
+import traceback
+from PyQt5.QtCore import pyqtSignal, QThread, QMutex, QWaitCondition
+from simulation_engine import SimulationEngine
+from profiler import PROFILER
+
+class RenderThread(QThread):
+    """
+    Runs SimulationEngine renders off the GUI thread.
+    Only the most recent request is kept: a new request replaces any
+    pending one that has not started yet, so a fast slider drag renders
+    the latest parameters instead of queueing every intermediate value.
+    Preview (proxy) and full renders use separate engines so their stage
+    memos do not evict each other.
+    """
+    rendered = pyqtSignal(object, bool)  # BGR image, is_full_resolution
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.engine = SimulationEngine(profiler=PROFILER)
+        self.preview_engine = SimulationEngine(profiler=PROFILER, name='simulator.preview')
+        self._mutex = QMutex()
+        self._wake = QWaitCondition()
+        self._pending = None
+        self._stopping = False
+        self._render_lock = threading.Lock()
+
+    def request(self, img, params, changed_param=None, display_size=None):
+        """Queue a render. display_size selects a proxy preview; None renders full resolution."""
+        self._mutex.lock()
+        if self._pending is not None and self._pending[2] == 'all':
+            # Keep a forced full re-render even if it gets coalesced away.
+            changed_param = 'all'
+        self._pending = (img, dict(params), changed_param, display_size)
+        self._wake.wakeOne()
+        self._mutex.unlock()
+
+    def render_now(self, img, params):
+        """Full-resolution render on the calling thread, for when the result is needed immediately."""
+        self._mutex.lock()
+        self._pending = None
+        self._mutex.unlock()
+        with self._render_lock:
+            return self.engine.render(img, params)
+
+    def stop(self):
+        self._mutex.lock()
+        self._stopping = True
+        self._pending = None
+        self._wake.wakeOne()
+        self._mutex.unlock()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while self._pending is None and not self._stopping:
+                self._wake.wait(self._mutex)
+            if self._stopping:
+                self._mutex.unlock()
+                return
+            img, params, changed_param, display_size = self._pending
+            self._pending = None
+            self._mutex.unlock()
+
+            try:
+                with self._render_lock:
+                    if display_size is None:
+                        result = self.engine.render(img, params, changed_param)
+                    else:
+                        result = self.preview_engine.render_preview(img, params, display_size, changed_param)
+                self.rendered.emit(result, display_size is None)
+            except Exception:
+                print("\n!!!!!!!!!! RENDER THREAD CRASHED !!!!!!!!!!")
+                traceback.print_exc()
@@ -253,6 +253,63 @@ class Ui_MainWindow(object):
         self.ResolutionDropDown.addItem("")
         self.verticalLayout_11.addWidget(self.ResolutionDropDown)
         self.verticalLayout.addWidget(self.Resolution)
+        self.ColorFilter = QtWidgets.QWidget(self.Parameters)
+        self.ColorFilter.setEnabled(True)
+        self.ColorFilter.setObjectName("ColorFilter")
+        self.verticalLayout_17 = QtWidgets.QVBoxLayout(self.ColorFilter)
+        self.verticalLayout_17.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_17.setSpacing(8)
+        self.verticalLayout_17.setObjectName("verticalLayout_17")
+        self.ColorFilterLabel = QtWidgets.QLabel(self.ColorFilter)
+        self.ColorFilterLabel.setStyleSheet("font-size: 14px;\n"
+"color: #e5e7eb;")
+        self.ColorFilterLabel.setFont(space_grotesk)
+        self.ColorFilterLabel.setObjectName("ColorFilterLabel")
+        self.verticalLayout_17.addWidget(self.ColorFilterLabel)
+        self.ColorFilterDropDown = QtWidgets.QComboBox(self.ColorFilter)
+        self.ColorFilterDropDown.setStyleSheet("color: #e5e7eb;\n"
+"font-size: 14px;\n"
+"background-color: #1f2937;\n"
+"padding: 8px 40px 8px 12px;\n"
+"border-color: rgb(55 65 81);\n"
+"border-radius: 4px")
+        self.ColorFilterDropDown.setFont(space_grotesk)
+        self.ColorFilterDropDown.setObjectName("ColorFilterDropDown")
+        self.ColorFilterDropDown.addItem("")
+        self.ColorFilterDropDown.addItem("")
+        self.ColorFilterDropDown.addItem("")
+        self.ColorFilterDropDown.addItem("")
+        self.ColorFilterDropDown.addItem("")
+        self.verticalLayout_17.addWidget(self.ColorFilterDropDown)
+        self.verticalLayout.addWidget(self.ColorFilter)
+        self.Demosaic = QtWidgets.QWidget(self.Parameters)
+        self.Demosaic.setEnabled(True)
+        self.Demosaic.setObjectName("Demosaic")
+        self.verticalLayout_18 = QtWidgets.QVBoxLayout(self.Demosaic)
+        self.verticalLayout_18.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_18.setSpacing(8)
+        self.verticalLayout_18.setObjectName("verticalLayout_18")
+        self.DemosaicLabel = QtWidgets.QLabel(self.Demosaic)
+        self.DemosaicLabel.setStyleSheet("font-size: 14px;\n"
+"color: #e5e7eb;")
+        self.DemosaicLabel.setFont(space_grotesk)
+        self.DemosaicLabel.setObjectName("DemosaicLabel")
+        self.verticalLayout_18.addWidget(self.DemosaicLabel)
+        self.DemosaicDropDown = QtWidgets.QComboBox(self.Demosaic)
+        self.DemosaicDropDown.setStyleSheet("color: #e5e7eb;\n"
+"font-size: 14px;\n"
+"background-color: #1f2937;\n"
+"padding: 8px 40px 8px 12px;\n"
+"border-color: rgb(55 65 81);\n"
+"border-radius: 4px")
+        self.DemosaicDropDown.setFont(space_grotesk)
+        self.DemosaicDropDown.setObjectName("DemosaicDropDown")
+        self.DemosaicDropDown.addItem("")
+        self.DemosaicDropDown.addItem("")
+        self.DemosaicDropDown.addItem("")
+        self.DemosaicDropDown.addItem("")
+        self.verticalLayout_18.addWidget(self.DemosaicDropDown)
+        self.verticalLayout.addWidget(self.Demosaic)
         self.ApplySettings = QtWidgets.QPushButton(self.Parameters)
         self.ApplySettings.setStyleSheet("QPushButton {\n"
 "    background-color: #1193d4;\n"
@@ -281,6 +338,8 @@ class Ui_MainWindow(object):
         self.SensorConfiguration.raise_()
         self.SensorType.raise_()
         self.Resolution.raise_()
+        self.ColorFilter.raise_()
+        self.Demosaic.raise_()
         self.ApplySettings.raise_()
         self.verticalLayout_2.addWidget(self.Parameters)
         spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
@@ -445,6 +504,17 @@ class Ui_MainWindow(object):
         self.ResolutionDropDown.setItemText(0, _translate("MainWindow", "1920 x 1080"))
         self.ResolutionDropDown.setItemText(1, _translate("MainWindow", "1280 x 720"))
         self.ResolutionDropDown.setItemText(2, _translate("MainWindow", "800 x 600"))
+        self.ColorFilterLabel.setText(_translate("MainWindow", "Color Filter Array"))
+        self.ColorFilterDropDown.setItemText(0, _translate("MainWindow", "None"))
+        self.ColorFilterDropDown.setItemText(1, _translate("MainWindow", "RGGB"))
+        self.ColorFilterDropDown.setItemText(2, _translate("MainWindow", "BGGR"))
+        self.ColorFilterDropDown.setItemText(3, _translate("MainWindow", "GRBG"))
+        self.ColorFilterDropDown.setItemText(4, _translate("MainWindow", "GBRG"))
+        self.DemosaicLabel.setText(_translate("MainWindow", "Demosaicing"))
+        self.DemosaicDropDown.setItemText(0, _translate("MainWindow", "Bilinear"))
+        self.DemosaicDropDown.setItemText(1, _translate("MainWindow", "Edge-aware"))
+        self.DemosaicDropDown.setItemText(2, _translate("MainWindow", "VNG"))
+        self.DemosaicDropDown.setItemText(3, _translate("MainWindow", "None"))
         self.ApplySettings.setText(_translate("MainWindow", "Apply Settings"))
         self.CameraOpticsSimulation.setText(_translate("MainWindow", "Camera Optics Simulation"))
         self.OriginalImage.setText(_translate("MainWindow", "Original Image"))
@@ -1,7 +1,8 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 from sensor_and_noise_parameter import Ui_MainWindow as Ui_SensorAndNoiseParameter
+from sensor_engine import SensorEngine
+from cfa import raw_to_bgr
 import cv2
-import numpy as np
 
 class SensorAndNoiseParameterLogic(QtWidgets.QMainWindow):
     def __init__(self, parent=None, img=None, img_size=None):
@@ -10,6 +11,7 @@ class SensorAndNoiseParameterLogic(QtWidgets.QMainWindow):
         self.ui.setupUi(self)
         
         self.img = None
+        self.engine = SensorEngine()
 
         self.connect_signals()
         self.set_img(img, img_size)
@@ -29,10 +31,6 @@ class SensorAndNoiseParameterLogic(QtWidgets.QMainWindow):
             self.ui.SimulatedDefault.setPixmap(pixmap)
             self.ui.OriginalDefault.setScaledContents(False)
             self.ui.SimulatedDefault.setScaledContents(False)
-            
-            img_data = cv2.imread(img)
-            
-            h, w = img_data.shape[:2]
 
     def connect_signals(self):
         self.ui.SensorTypeDropDown.currentIndexChanged.connect(self.update_simulation)
@@ -43,87 +41,41 @@ class SensorAndNoiseParameterLogic(QtWidgets.QMainWindow):
         self.ui.DynamicRangeSlider.rangeChanged.connect(self.dynamic_range_val_update)
         self.ui.DynamicRangeSlider.sliderReleased.connect(self.update_simulation)
         self.ui.ResolutionDropDown.currentIndexChanged.connect(self.update_simulation)
+        self.ui.ColorFilterDropDown.currentIndexChanged.connect(self.update_simulation)
+        self.ui.DemosaicDropDown.currentIndexChanged.connect(self.update_simulation)
 
     def update_simulation(self):
         if not self.img:
             return
         
-        img = cv2.imread(self.img)
-        img = self.apply_exposure_time(img)
-        img = self.apply_dynamic_range(img)
-        img = self.apply_noise(img)
-        img = self.apply_resolution(img)
+        profiler = self.parent().profiler
+        img = self.parent().image_store.get(self.img)
+        img = profiler.measure('sensor.tone', self.apply_tone, img)
+        img = profiler.measure('sensor.mosaic', self.apply_mosaic, img)
+        img = profiler.measure('sensor.noise', self.apply_noise, img)
+        img = profiler.measure('sensor.demosaic', self.apply_demosaic, img)
+        img = profiler.measure('sensor.resolution', self.apply_resolution, img)
 
         self.display_image(img)
 
     def apply_noise(self, img):
-        sensor_type = self.ui.SensorTypeDropDown.currentText()
         noise_level = self.ui.NoiseLevelSlider.value()
         self.ui.NoiseLevelNumber.setText(f'{noise_level}')
+        return self.engine.apply_noise(img, self.ui.SensorTypeDropDown.currentText(), noise_level,
+                                       self.ui.ExposureTimeSlider.value())
 
-        if noise_level == 0:
-            return img
-        
-        h, w, c = img.shape
-        img_float = img.astype(np.float32)
-
-        if sensor_type == "CMOS":
-            mean = 0
-            sigma = noise_level
-            gaussian_noise = np.random.normal(mean, sigma, (h, w, c))
-            noisy_img = img_float + gaussian_noise
-            
-        elif sensor_type == "CCD":
-            scale = (255.0 / noise_level) if noise_level > 0 else 255.0
-            noisy_img = np.random.poisson(img / scale) * scale
-            
-        else:
-            mean = 0
-            sigma = noise_level
-            gaussian_noise = np.random.normal(mean, sigma, (h, w, c))
-            noisy_img = img_float + gaussian_noise
+    def apply_tone(self, img):
+        return self.engine.apply_tone(img, self.ui.ExposureTimeSlider.value(), *self.ui.DynamicRangeSlider.getValues())
 
-        noisy_img = np.clip(noisy_img, 0, 255)
-        return noisy_img.astype(np.uint8)
+    def apply_mosaic(self, img):
+        return self.engine.apply_mosaic(img, self.ui.ColorFilterDropDown.currentText())
 
-    def apply_exposure_time(self, img):
-        exposure = self.ui.ExposureTimeSlider.value()
-        if exposure == 50:
-            return img
-        if exposure < 50:
-            exposure_factor = 0.1 + (exposure / 50.0) * 0.9
-        else:
-            exposure_factor = 1.0 + ((exposure - 50) / 50.0) * 2.0
-        
-        img_float = img.astype(np.float32) * exposure_factor
-        img_float = np.clip(img_float, 0, 255)
-        return img_float.astype(np.uint8)
-
-    def apply_dynamic_range(self, img):
-        min_val, max_val = self.ui.DynamicRangeSlider.getValues()
-        
-        img_float = img.astype(np.float32)
-        img_float = np.clip(img_float, min_val, max_val)
-        
-        if max_val > min_val:
-            img_float = (img_float - min_val) * (255.0 / (max_val - min_val))
-            
-        img_float = np.clip(img_float, 0, 255)
-        
-        return img_float.astype(np.uint8)
+    def apply_demosaic(self, img):
+        return self.engine.apply_demosaic(img, self.ui.ColorFilterDropDown.currentText(),
+                                          self.ui.DemosaicDropDown.currentText())
 
     def apply_resolution(self, img):
-        resolution_text = self.ui.ResolutionDropDown.currentText()
-        
-        parts = resolution_text.split(' x ')
-        target_w = int(parts[0])
-        target_h = int(parts[1])
-
-        if img.shape[1] == target_w and img.shape[0] == target_h:
-            return img
-            
-        resized_img = cv2.resize(img, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
-        return resized_img
+        return self.engine.apply_resolution(img, self.ui.ResolutionDropDown.currentText())
 
     def noise_val_update(self):
         noise_level = self.ui.NoiseLevelSlider.value()
@@ -137,6 +89,9 @@ class SensorAndNoiseParameterLogic(QtWidgets.QMainWindow):
         self.ui.DynamicRangeNumber.setText(f'{min_val} - {max_val}')
 
     def display_image(self, img):
+        if img.ndim == 2:
+            # Raw Bayer frame: show every site in its filter colour.
+            img = raw_to_bgr(img, self.ui.ColorFilterDropDown.currentText())
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         h, w, ch = img_rgb.shape
         bytes_per_line = ch * w
@@ -0,0 +1,166 @@
+import functools
+import cv2
+import numpy as np
+from cfa import mosaic, demosaic
+from map_cache import MapCache
+from noise import run_chunked, poisson
+from simulation_engine import SimulationEngine, exposure_factor
+
+DEFAULT_SENSOR_PARAMS = {
+    'sensor_type': 'CMOS',
+    'noise_level': 0,
+    'exposure_time': 50,
+    'dynamic_range': (0, 255),
+    'resolution': None,
+    'cfa_pattern': 'None',
+    'demosaic': 'Bilinear',
+    'seed': 0
+}
+
+# Typical figures for industrial sensors. full_well, read_noise and
+# column_fpn are in electrons, dark_current in e-/s at operating
+# temperature, prnu and dsnu are relative (1 sigma) pixel-to-pixel spread of
+# the gain and of the dark current.
+SENSOR_MODELS = {
+    'CMOS': {'full_well': 10000, 'read_noise': 3.0, 'dark_current': 50.0, 'prnu': 0.01, 'dsnu': 0.4, 'column_fpn': 1.5},
+    'CCD': {'full_well': 40000, 'read_noise': 8.0, 'dark_current': 10.0, 'prnu': 0.005, 'dsnu': 0.2, 'column_fpn': 0.0},
+    'sCMOS': {'full_well': 30000, 'read_noise': 1.5, 'dark_current': 2.0, 'prnu': 0.003, 'dsnu': 0.3, 'column_fpn': 0.3}
+}
+
+# Fixed-pattern maps get their own cache, so switching sensor types at high
+# resolution never evicts the remap maps MAP_CACHE is there for. 256 MB
+# holds one 20 MP sensor or several smaller ones.
+FIXED_PATTERN_CACHE = MapCache(max_bytes=256 * 1024 * 1024)
+
+def fixed_pattern_maps(shape, model, seed):
+    """
+    Per-pixel gain (PRNU), per-pixel dark current in e-/s (DSNU) and
+    per-column offset in electrons for one physical sensor. Colour
+    channels share a pixel's pattern, so the maps are single-channel,
+    (h, w, 1) for colour images, and the column offset is a single row;
+    both broadcast over the frame.
+    """
+    map_shape = tuple(shape[:2]) + ((1,) if len(shape) > 2 else ())
+    rng = np.random.default_rng(seed)
+    prnu = 1.0 + model['prnu'] * rng.standard_normal(map_shape, dtype=np.float32)
+    dark = model['dark_current'] * np.maximum(0.0, 1.0 + model['dsnu'] * rng.standard_normal(map_shape, dtype=np.float32))
+    column = model['column_fpn'] * rng.standard_normal((1,) + map_shape[1:], dtype=np.float32)
+    return prnu, dark.astype(np.float32), column
+
+@functools.lru_cache(maxsize=32)
+def tone_lut(exposure, min_val, max_val, depth=8):
+    """
+    Exposure time followed by dynamic range stretch as one lookup table over
+    every input value (256 entries for 8-bit, 65536 for 16-bit). min_val and
+    max_val are on the 8-bit scale. Tables are cached, so one is only built
+    when the sliders change.
+    """
+    top = 255 if depth == 8 else 65535
+    dtype = np.uint8 if depth == 8 else np.uint16
+    scale = top / 255.0
+    lo, hi = min_val * scale, max_val * scale
+
+    values = np.arange(top + 1, dtype=np.float32) * exposure_factor(exposure)
+    values = np.clip(values, 0, top).astype(dtype).astype(np.float32)
+    values = np.clip(values, lo, hi)
+    if hi > lo:
+        values = (values - lo) * (top / (hi - lo))
+    lut = np.clip(values, 0, top).astype(dtype)
+    lut.flags.writeable = False
+    return lut
+
+class SensorEngine:
+    """
+    Qt-free version of the Sensor and Noise Parameters pipeline
+    (tone: exposure time + dynamic range -> CFA mosaic -> sensor noise ->
+    demosaic -> resolution). With a cfa_pattern set, noise is applied to the
+    single-channel raw frame, as on a real camera; demosaic 'None' returns
+    the raw frame itself.
+    The fixed-pattern maps of each (sensor type, resolution, seed) are built
+    once and kept in map_cache, defaulting to FIXED_PATTERN_CACHE.
+    """
+
+    def __init__(self, map_cache=None):
+        self.map_cache = map_cache if map_cache is not None else FIXED_PATTERN_CACHE
+
+    def render(self, img, params, rng=None):
+        p = dict(DEFAULT_SENSOR_PARAMS)
+        p.update(params)
+
+        img = self.apply_tone(img, p['exposure_time'], *p['dynamic_range'])
+        img = self.apply_mosaic(img, p['cfa_pattern'])
+        img = self.apply_noise(img, p['sensor_type'], p['noise_level'], p['exposure_time'], p['seed'], rng)
+        img = self.apply_demosaic(img, p['cfa_pattern'], p['demosaic'])
+        img = self.apply_resolution(img, p['resolution'])
+        return img
+
+    def fixed_pattern(self, shape, sensor_type, seed=0):
+        key = ('fpn', sensor_type, tuple(shape[:2]), len(shape) > 2, seed)
+        return self.map_cache.get(key, lambda: fixed_pattern_maps(shape, SENSOR_MODELS[sensor_type], seed))
+
+    def apply_noise(self, img, sensor_type, noise_level, exposure_time=50, seed=0, rng=None):
+        """
+        Photon shot noise, dark current over exposure_time (ms), read noise
+        and PRNU/DSNU/column fixed-pattern noise. noise_level is the analog
+        gain: full scale corresponds to full_well / noise_level electrons,
+        so a higher gain means fewer photons and more visible noise. Only the
+        temporal noise is drawn per frame; the fixed pattern is cached.
+        """
+        if noise_level == 0:
+            return img
+        if sensor_type not in SENSOR_MODELS:
+            sensor_type = 'CMOS'
+        model = SENSOR_MODELS[sensor_type]
+        prnu, dark, column = self.fixed_pattern(img.shape, sensor_type, seed)
+
+        electrons_per_dn = model['full_well'] / (255.0 * noise_level)
+        seconds = exposure_time / 1000.0
+        # Black level clamp removes the mean dark signal, not its spatial pattern.
+        offset = column - model['dark_current'] * seconds
+        result = np.empty_like(img)
+
+        def expose(rows, gen):
+            signal = img[rows].astype(np.float32)
+            signal *= prnu[rows]
+            signal *= electrons_per_dn
+            signal += dark[rows] * seconds
+            electrons = poisson(signal, gen)
+            electrons += model['read_noise'] * gen.standard_normal(signal.shape, dtype=np.float32)
+            electrons += offset
+            electrons *= 1.0 / electrons_per_dn
+            np.clip(electrons, 0, 255, out=electrons)
+            result[rows] = electrons
+
+        run_chunked(expose, img.shape, rng)
+        return result
+
+    @staticmethod
+    def apply_tone(img, exposure, min_val=0, max_val=255):
+        """Exposure time and dynamic range in a single table lookup."""
+        if exposure == 50 and min_val == 0 and max_val == 255:
+            return img
+        if img.dtype == np.uint16:
+            return tone_lut(exposure, min_val, max_val, 16)[img]
+        return cv2.LUT(img, tone_lut(exposure, min_val, max_val))
+
+    @staticmethod
+    def apply_exposure_time(img, exposure):
+        return SensorEngine.apply_tone(img, exposure)
+
+    @staticmethod
+    def apply_dynamic_range(img, min_val, max_val):
+        return SensorEngine.apply_tone(img, 50, min_val, max_val)
+
+    @staticmethod
+    def apply_mosaic(img, pattern):
+        if pattern == 'None' or img.ndim == 2:
+            return img
+        return mosaic(img, pattern)
+
+    @staticmethod
+    def apply_demosaic(raw, pattern, method):
+        if pattern == 'None' or method == 'None' or raw.ndim == 3:
+            return raw
+        return demosaic(raw, pattern, method)
+
+    apply_resolution = staticmethod(SimulationEngine.apply_resolution)
@@ -0,0 +1,371 @@
+import functools
+import cv2
+import numpy as np
+from map_cache import MAP_CACHE
+from noise import add_gaussian_noise
+
+DEFAULT_PARAMS = {
+    'zoom': 0,
+    'fov': 60,
+    'distortion': 0,
+    'brightness': 0,
+    'ld': 45,
+    'shadows': 0,
+    'noise': 0,
+    'exposure': 50
+}
+
+def parse_resolution(resolution):
+    """Accept either a 'W x H' drop-down string or a (w, h) pair."""
+    if resolution is None:
+        return None
+    if isinstance(resolution, str):
+        parts = resolution.split(' x ')
+        return int(parts[0]), int(parts[1])
+    w, h = resolution
+    return int(w), int(h)
+
+def _inside(map_x, map_y, w, h):
+    return (map_x >= -0.5) & (map_x <= w - 0.5) & (map_y >= -0.5) & (map_y <= h - 0.5)
+
+def radial_maps(w, h, k1, cx, cy):
+    """Single-coefficient radial distortion about (cx, cy), normalised by the half-diagonal."""
+    map_x, map_y = np.meshgrid(np.arange(w, dtype=np.float32), np.arange(h, dtype=np.float32))
+    norm_denom = (w/2)**2 + (h/2)**2
+    if norm_denom == 0:
+        norm_denom = 1
+    dx, dy = map_x - cx, map_y - cy
+    radial = 1 + np.float32(k1 / norm_denom) * (dx * dx + dy * dy)
+    return cx + dx * radial, cy + dy * radial
+
+def _fov_ratio(fov):
+    # K_default @ inv(K_new) is a pure scaling about the image centre.
+    return np.float32(np.tan(np.radians(fov / 2.0)) / np.tan(np.radians(60 / 2.0)))
+
+def fov_maps(w, h, fov):
+    ratio = _fov_ratio(fov)
+    xs = (np.arange(w, dtype=np.float32) - w / 2.0) * ratio + w / 2.0
+    ys = (np.arange(h, dtype=np.float32) - h / 2.0) * ratio + h / 2.0
+    map_x, map_y = np.meshgrid(xs.astype(np.float32), ys.astype(np.float32))
+    return map_x, map_y
+
+# Source coordinate for pixels that sample nothing and stay black.
+OFF_IMAGE = -1e4
+
+def geometry_maps(w, h, zoom, fov, distortion):
+    """
+    Composes the distortion, FOV and zoom stages into one pair of float32
+    remap maps. Each output pixel is traced backwards through the stages
+    (distortion -> FOV -> zoom) to a source coordinate, and pixels that the
+    chained version would have sampled from outside an intermediate frame
+    are sent off-image so they stay black.
+    """
+    valid = None
+    if distortion != 0:
+        map_x, map_y = radial_maps(w, h, distortion / 1000.0, w // 2, h // 2)
+        valid = _inside(map_x, map_y, w, h)
+    else:
+        map_x, map_y = np.meshgrid(np.arange(w, dtype=np.float32), np.arange(h, dtype=np.float32))
+
+    if fov != 60:
+        ratio = _fov_ratio(fov)
+        map_x = (map_x - w / 2.0) * ratio + w / 2.0
+        map_y = (map_y - h / 2.0) * ratio + h / 2.0
+        inside = _inside(map_x, map_y, w, h)
+        valid = inside if valid is None else valid & inside
+
+    if zoom != 0:
+        if zoom > 0:
+            scale = 1.0 + (zoom / 100.0)
+        else:
+            scale = 1.0 + (zoom / 200.0)
+        new_w = int(w * scale)
+        new_h = int(h * scale)
+        if scale > 1.0:
+            off_x, off_y = (new_w - w) // 2, (new_h - h) // 2
+        else:
+            off_x, off_y = -((w - new_w) // 2), -((h - new_h) // 2)
+        # Same pixel-centre convention as cv2.resize with INTER_LINEAR.
+        map_x = (map_x + (off_x + 0.5)) * np.float32(w / new_w) - 0.5
+        map_y = (map_y + (off_y + 0.5)) * np.float32(h / new_h) - 0.5
+
+    map_x = map_x.astype(np.float32, copy=False)
+    map_y = map_y.astype(np.float32, copy=False)
+    if valid is not None:
+        # Far outside the image rather than just past its edge: -1 lies in
+        # the interpolation border band, which sends cv2.remap down its slow
+        # partial-border path. Still fits the fixed-point maps' int16 range.
+        map_x[~valid] = OFF_IMAGE
+        map_y[~valid] = OFF_IMAGE
+    return map_x, map_y
+
+def exposure_factor(exposure):
+    if exposure < 50:
+        return 0.1 + (exposure / 50.0) * 0.9
+    return 1.0 + ((exposure - 50) / 50.0) * 2.0
+
+@functools.lru_cache(maxsize=64)
+def lighting_lut(brightness, exposure):
+    """
+    Brightness offset, then exposure gain, as a 256-entry table. Each step
+    is computed in float32, clipped and truncated like the original
+    per-stage code, so the result matches it value for value.
+    """
+    values = np.arange(256, dtype=np.float32)
+    if brightness != 0:
+        values = np.clip(values + brightness * 2.55, 0, 255).astype(np.uint8).astype(np.float32)
+    if exposure != 50:
+        values = np.clip(values * exposure_factor(exposure), 0, 255)
+    lut = values.astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+def light_direction_field(w, h, azimuth):
+    """Directional lighting falloff between 0.7 and 1.0 across the frame."""
+    azimuth_rad = np.radians(azimuth)
+    x_coords = np.linspace(-1, 1, w, dtype=np.float32) * np.float32(np.cos(azimuth_rad))
+    y_coords = np.linspace(-1, 1, h, dtype=np.float32) * np.float32(np.sin(azimuth_rad))
+    alignment = y_coords[:, None] + x_coords[None, :]
+
+    min_intensity = 0.7
+    max_intensity = 1.0
+    intensity = min_intensity + (alignment + 1) / 2 * (max_intensity - min_intensity)
+    return np.clip(intensity, min_intensity, max_intensity, out=intensity)
+
+def shadow_field(w, h, shadow_intensity):
+    """Diagonal shadow gain, darkest in the top-left corner and never below 0.5."""
+    x_gradient = np.linspace(0, 1, w, dtype=np.float32)
+    y_gradient = np.linspace(0, 1, h, dtype=np.float32)
+    shadow_mask = 1.0 - ((y_gradient[:, None] + x_gradient[None, :]) / 2.0)
+
+    shadow_strength = shadow_intensity / 100.0
+    shadow_mask = 1.0 - (shadow_mask * np.float32(shadow_strength * 0.5))
+    return np.clip(shadow_mask, 0.5, 1.0, out=shadow_mask)
+
+def make_proxy(img, display_size):
+    """Downsample img (INTER_AREA) so it fits inside display_size. Returns (proxy, scale)."""
+    h, w = img.shape[:2]
+    max_w, max_h = display_size
+    scale = min(max_w / w, max_h / h, 1.0)
+    if scale >= 1.0:
+        return img, 1.0
+    new_w, new_h = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+    return cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA), scale
+
+def preview_params(params, scale, display_size):
+    """
+    Rescales a parameter dict for a proxy rendered at `scale` of the source.
+    Zoom, FOV, distortion and lighting are already defined relative to the
+    frame, so they carry over unchanged. Noise is scaled so that it looks
+    the way the full render does once it is shrunk to the display, and the
+    output resolution is fitted into display_size with the same aspect.
+    """
+    p = dict(params)
+    p['noise'] = p.get('noise', 0) * scale
+    target = parse_resolution(p.get('resolution'))
+    if target is not None:
+        target_w, target_h = target
+        fit = min(display_size[0] / target_w, display_size[1] / target_h, 1.0)
+        p['resolution'] = (max(1, int(target_w * fit)), max(1, int(target_h * fit)))
+    return p
+
+class SimulationEngine:
+    """
+    Qt-free version of the Simulator Control Panel pipeline.
+    Takes a BGR uint8 image and a parameter dict with the same keys as
+    AppWindow.current_params (plus an optional 'resolution') and returns
+    the rendered BGR image.
+    Remap coordinate maps come from map_cache, which defaults to the
+    process-wide MAP_CACHE. If a StageProfiler is given, every stage is
+    recorded under '<name>.<stage>'.
+    """
+
+    # Pipeline order, with the parameters each stage reads.
+    STAGES = (
+        ('geometry', ('zoom', 'fov', 'distortion')),
+        ('lighting', ('brightness', 'ld', 'shadows', 'exposure')),
+        ('noise', ('noise',)),
+        ('resolution', ('resolution',))
+    )
+
+    def __init__(self, map_cache=None, memoize=True, profiler=None, name='simulator'):
+        self.map_cache = map_cache if map_cache is not None else MAP_CACHE
+        self.memoize = memoize
+        self.profiler = profiler
+        self.name = name
+        self._source = None
+        self._memo = []
+        self._proxy = None
+
+    def clear_memo(self):
+        self._source = None
+        self._memo = []
+        self._proxy = None
+
+    def _first_dirty_stage(self, img, params, changed_param):
+        if not self.memoize or changed_param == 'all' or img is not self._source:
+            return 0
+        for i, (name, keys) in enumerate(self.STAGES):
+            if i >= len(self._memo):
+                return i
+            if changed_param in keys or self._memo[i][0] != tuple(params.get(k) for k in keys):
+                return i
+        return len(self.STAGES)
+
+    def _run_stage(self, name, img, p, rng=None):
+        if name == 'geometry':
+            return self.apply_geometry(img, p['zoom'], p['fov'], p['distortion'])
+        if name == 'lighting':
+            return self.apply_lighting(img, p['brightness'], p['ld'], p['shadows'], p['exposure'])
+        if name == 'noise':
+            return self.apply_noise(img, p['noise'], rng)
+        return self.apply_resolution(img, p.get('resolution'))
+
+    def render(self, img, params, changed_param=None, rng=None):
+        """
+        Runs the pipeline on img. rng (a numpy Generator) makes the noise
+        reproducible; by default a fresh unseeded Generator is used. With
+        memoize on, the output of every stage is kept, and a later call on
+        the same source array restarts from the first stage whose parameters
+        changed (or that changed_param belongs to, so e.g. a re-released
+        noise slider re-rolls the noise).
+        changed_param='all' always renders from scratch.
+        """
+        p = dict(DEFAULT_PARAMS)
+        p.update(params)
+
+        start = self._first_dirty_stage(img, p, changed_param)
+        result = img if start == 0 else self._memo[start - 1][1]
+        memo = self._memo[:start]
+        for name, keys in self.STAGES[start:]:
+            if self.profiler is not None:
+                result = self.profiler.measure(f'{self.name}.{name}', self._run_stage, name, result, p, rng)
+            else:
+                result = self._run_stage(name, result, p, rng)
+            if self.memoize:
+                memo.append((tuple(p.get(k) for k in keys), result))
+
+        if self.memoize:
+            self._source = img
+            self._memo = memo
+        return result
+
+    def render_preview(self, img, params, display_size, changed_param=None):
+        """
+        Interactive render on a proxy of img sized to display_size.
+        The proxy is built once per (source, display size) so the memo keeps
+        working across slider moves.
+        """
+        display_size = tuple(display_size)
+        if self._proxy is None or self._proxy[0] is not img or self._proxy[1] != display_size:
+            if self.profiler is not None:
+                proxy, scale = self.profiler.measure(f'{self.name}.proxy', make_proxy, img, display_size)
+            else:
+                proxy, scale = make_proxy(img, display_size)
+            self._proxy = (img, display_size, proxy, scale)
+        _, _, proxy, scale = self._proxy
+        return self.render(proxy, preview_params(params, scale, display_size), changed_param)
+
+    def apply_geometry(self, img, zoom, fov, distortion):
+        """Zoom, FOV and radial distortion as a single remap."""
+        if fov == 60 and distortion == 0:
+            # A plain zoom is already a single resample.
+            return self.apply_zoom(img, zoom)
+
+        h, w = img.shape[:2]
+        map1, map2 = self.map_cache.remap_maps(
+            ('geometry', w, h, zoom, fov, distortion / 1000.0, w // 2, h // 2),
+            lambda: geometry_maps(w, h, zoom, fov, distortion))
+        return cv2.remap(img, map1, map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+
+    @staticmethod
+    def apply_zoom(img, zoom_percent):
+        if zoom_percent == 0:
+            return img
+
+        h, w = img.shape[:2]
+        if zoom_percent > 0:
+            scale = 1.0 + (zoom_percent / 100.0)
+        else:
+            scale = 1.0 + (zoom_percent / 200.0)
+
+        new_w = int(w * scale)
+        new_h = int(h * scale)
+        resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+        if scale > 1.0:
+            start_x = (new_w - w) // 2
+            start_y = (new_h - h) // 2
+            return resized[start_y:start_y + h, start_x:start_x + w]
+        else:
+            zoomed = np.zeros((h, w, img.shape[2]), dtype=img.dtype)
+            start_x = (w - new_w) // 2
+            start_y = (h - new_h) // 2
+            zoomed[start_y:start_y + new_h, start_x:start_x + new_w] = resized
+            return zoomed
+
+    def apply_fov(self, img, fov_degrees):
+        if fov_degrees == 60:
+            return img
+
+        h, w = img.shape[:2]
+        map1, map2 = self.map_cache.remap_maps(('fov', w, h, fov_degrees), lambda: fov_maps(w, h, fov_degrees))
+        return cv2.remap(img, map1, map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+
+    def apply_distortion(self, img, distortion):
+        if distortion == 0:
+            return img
+
+        h, w = img.shape[:2]
+        cx, cy = w // 2, h // 2
+        k1 = distortion / 1000.0
+        map1, map2 = self.map_cache.remap_maps(('radial', w, h, k1, cx, cy), lambda: radial_maps(w, h, k1, cx, cy))
+        return cv2.remap(img, map1, map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+
+    @staticmethod
+    def apply_lighting(img, brightness, ld, shadows, exposure):
+        """
+        Brightness, light direction, shadows and exposure in one pass.
+        The brightness offset (and exposure, when it is the only gain) is a
+        lookup table; otherwise a single per-pixel gain field (ld x shadows
+        x exposure) is applied with one clip and one conversion back to
+        uint8. Both paths truncate, as the original per-stage code did.
+        """
+        if ld == 45 and shadows == 0:
+            if brightness == 0 and exposure == 50:
+                return img
+            return cv2.LUT(img, lighting_lut(brightness, exposure))
+
+        if brightness != 0:
+            img = cv2.LUT(img, lighting_lut(brightness, 50))
+
+        h, w = img.shape[:2]
+        gain = np.ones((h, w), dtype=np.float32)
+        if ld != 45:
+            gain *= light_direction_field(w, h, ld)
+        if shadows != 0:
+            gain *= shadow_field(w, h, shadows)
+        if exposure != 50:
+            gain *= np.float32(exposure_factor(exposure))
+
+        result = img * (gain if img.ndim == 2 else gain[:, :, None])
+        np.clip(result, 0, 255, out=result)
+        return result.astype(np.uint8)
+
+    @staticmethod
+    def apply_noise(img, noise_level, rng=None):
+        if noise_level == 0:
+            return img
+        return add_gaussian_noise(img, noise_level, rng)
+
+    @staticmethod
+    def apply_resolution(img, resolution):
+        target = parse_resolution(resolution)
+        if target is None:
+            return img
+        target_w, target_h = target
+
+        if img.shape[1] == target_w and img.shape[0] == target_h:
+            return img
+
+        return cv2.resize(img, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import generate_dataset
+
+SPEC = {'samples_per_source': 2, 'seed': 7, 'params': {'brightness': {'uniform': [-30, 30]}}}
+
+def _run(tmp_path, *extra):
+    return generate_dataset.main([str(tmp_path / 'in' / '**' / '*.png'), str(tmp_path / 'spec.json'),
+                                  str(tmp_path / 'out'), '--workers', '1', *extra])
+
+def _manifest(tmp_path):
+    with open(tmp_path / 'out' / 'manifest.jsonl') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_same_named_sources_in_subfolders(tmp_path, capsys):
+    for name in ('a/x.png', 'b/x.png', 'y.png'):
+        path = tmp_path / 'in' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(path), np.full((24, 32, 3), 100, np.uint8))
+    (tmp_path / 'spec.json').write_text(json.dumps(SPEC))
+
+    assert _run(tmp_path) == 0
+    records = _manifest(tmp_path)
+    assert len(records) == 6
+    assert len({r['id'] for r in records}) == 6
+    assert len({r['seed'] for r in records}) == 6
+    assert {r['id'] for r in records} == {'a/x_00000', 'a/x_00001', 'b/x_00000', 'b/x_00001', 'y_00000', 'y_00001'}
+    for r in records:
+        assert os.path.exists(tmp_path / 'out' / r['output'])
+        assert os.path.basename(os.path.dirname(r['source'])) in ('a', 'b', 'in')
+
+    capsys.readouterr()
+    assert _run(tmp_path, '--resume') == 0
+    assert '0 to render' in capsys.readouterr().out
+    assert len(_manifest(tmp_path)) == 6
+
+def test_stem_collisions_are_refused(tmp_path):
+    (tmp_path / 'in').mkdir()
+    for name in ('x.png', 'x.jpg'):
+        cv2.imwrite(str(tmp_path / 'in' / name), np.full((24, 32, 3), 100, np.uint8))
+    (tmp_path / 'spec.json').write_text(json.dumps(SPEC))
+    assert generate_dataset.main([str(tmp_path / 'in'), str(tmp_path / 'spec.json'), str(tmp_path / 'out'),
+                                  '--workers', '1']) == 2
+    assert not os.path.exists(tmp_path / 'out' / 'manifest.jsonl')
@@ -0,0 +1,61 @@
+import os
+import sys
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tuning_thread import TuningThread, from_level, to_level
+
+W, H = 1600, 1200
+SIGMA = 6.0
+TRUE = np.array([1300.0, 1300.0, 812.0, 587.0, -0.15, 0, 0, 0, 0])
+
+def _blobs(points):
+    """Gaussian blobs centred exactly on points (full-resolution pixels)."""
+    img = np.zeros((H, W), np.float32)
+    for x, y in points:
+        x0, x1, y0, y1 = int(x) - 30, int(x) + 31, int(y) - 30, int(y) + 31
+        xs, ys = np.meshgrid(np.arange(x0, x1), np.arange(y0, y1))
+        img[y0:y1, x0:x1] += 200.0 * np.exp(-((xs - x) ** 2 + (ys - y) ** 2) / (2 * SIGMA ** 2))
+    return img
+
+def _centroids(img):
+    """Intensity-weighted centroid in a window around each local blob."""
+    _, labels, stats, _ = cv2.connectedComponentsWithStats((img > img.max() * 0.2).astype(np.uint8))
+    points = []
+    for label in range(1, len(stats)):
+        ys, xs = np.nonzero(labels == label)
+        peak = np.argmax(img[ys, xs])
+        r = int(np.ceil(4 * SIGMA * img.shape[1] / W)) + 1
+        cx, cy = xs[peak], ys[peak]
+        win = img[cy - r:cy + r + 1, cx - r:cx + r + 1].astype(np.float64)
+        gy, gx = np.mgrid[cy - r:cy + r + 1, cx - r:cx + r + 1]
+        points.append(((gx * win).sum() / win.sum(), (gy * win).sum() / win.sum()))
+    return np.array(points)
+
+def _match_blobs(img1, img2, stats=None, guide=None, **kwargs):
+    base, target = _centroids(img1), _centroids(img2)
+    nearest = np.argmin(np.linalg.norm(base[:, None] - target[None], axis=2), axis=1)
+    if stats is not None:
+        stats['inliers'] = stats['ratio_matches'] = len(base)
+    return base.astype(np.float32), target[nearest].astype(np.float32)
+
+def test_level_mapping_round_trip():
+    points = np.array([[0.0, 0.0], [10.0, 7.5], [1599.0, 1199.0]])
+    for level in (1, 2, 3):
+        assert np.allclose(from_level(to_level(points, level), level), points)
+
+def test_pyramid_fit_recovers_principal_point(monkeypatch):
+    gx, gy = np.meshgrid(np.arange(140, W - 139, 110.0), np.arange(140, H - 139, 110.0))
+    base_pts = np.stack((gx.ravel(), gy.ravel()), axis=1)
+    target_pts = TuningThread._project(TRUE, base_pts)
+    monkeypatch.setattr(TuningThread, '_find_and_match_features', staticmethod(_match_blobs))
+
+    defaults = {'focal_length': 1200.0, 'k1': 0.0, 'cx': W / 2, 'cy': H / 2}
+    thread = TuningThread(_blobs(base_pts), _blobs(target_pts), {}, defaults, coarse_max_side=400, fine_max_side=800)
+    thread.callback = lambda x: None
+    res, _, _ = thread._match_and_optimize()
+
+    assert thread.match_stats['pyramid_levels'] == (2, 1)
+    assert abs(res.x[2] - TRUE[2]) < 0.1
+    assert abs(res.x[3] - TRUE[3]) < 0.1
@@ -1,20 +1,295 @@
 # tuning_thread.py
+import concurrent.futures
+import multiprocessing
+import os
 import numpy as np
 from PyQt5.QtCore import pyqtSignal, QThread
 import cv2
-from scipy.optimize import minimize
+from scipy.optimize import minimize, least_squares
+from scipy.spatial import cKDTree
+import time
 import traceback
+from profiler import PROFILER
+from feature_cache import FEATURE_CACHE, create_detector
+
+# Solvers for the intrinsics fit, and the robust losses least_squares accepts.
+SOLVERS = ('least_squares', 'lbfgsb')
+LOSSES = ('linear', 'huber', 'soft_l1', 'cauchy')
+
+# The full parameter vector: focal lengths and principal point in pixels,
+# radial (k1-k3) and tangential (p1, p2) Brown-Conrady coefficients.
+PARAMETERS = ('fx', 'fy', 'cx', 'cy', 'k1', 'k2', 'k3', 'p1', 'p2')
+FX, FY = 0, 1
+
+# Parameters each model fits; the rest stay at their defaults, except fy,
+# which follows fx (square pixels) unless the model includes it.
+MODELS = {
+    'Basic': ('fx', 'cx', 'cy', 'k1'),
+    'Radial': ('fx', 'cx', 'cy', 'k1', 'k2', 'k3'),
+    'Extended': PARAMETERS
+}
+
+# The page's lock toggles each hold a group of parameters; locks can also
+# name single parameters.
+LOCK_GROUPS = {
+    'focal_length': ('fx', 'fy'),
+    'distortion': ('k1', 'k2', 'k3', 'p1', 'p2')
+}
+
+# Set bits per byte, for Hamming distances between binary descriptors.
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint16)
+
+def to_level(points, level):
+    """
+    Full-resolution pixel coordinates -> coordinates in pyrDown level
+    'level'. pyrDown centres its kernel on source pixel 2i for destination
+    pixel i, so there is no half-pixel offset (unlike cv2.resize).
+    """
+    return points / 2 ** level
+
+def from_level(points, level):
+    return points * 2 ** level
+
+# Search radius, in fine-level pixels, around each position predicted by
+# the coarse fit. Coarse features are a pixel or two off at the fine level.
+GUIDE_RADIUS = 8.0
+
+# Multi-start solutions agree with the best one when their cost is within
+# this factor of it and every free parameter is within this fraction of its
+# bounds' width, i.e. they found the same minimum, not just an equally good one.
+AGREEMENT_TOLERANCE = 1e-3
+PARAMETER_TOLERANCE = 0.01
+
+_executor = None
+_executor_workers = 0
+
+def _init_worker():
+    cv2.setNumThreads(1)
+
+def _get_executor(workers):
+    """
+    Process pool for multi-start fits. It is kept between runs, so workers
+    are spawned (and import scipy/OpenCV) once per session, not per fit.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        # Spawned workers, since forking a process that runs Qt threads is unsafe.
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker)
+        _executor_workers = workers
+    return _executor
+
+def warm_up_pool(workers):
+    """Starts the multi-start workers in the background, e.g. while features are detected."""
+    executor = _get_executor(workers)
+    for _ in range(workers):
+        executor.submit(_init_worker)
+
+def objective(params, base_points, target_points):
+    """
+    The error function for the L-BFGS-B solver: the summed distance
+    between where the target points *should* be (given the full
+    PARAMETERS vector) and where they *actually* are.
+    """
+    r = residuals(params, base_points, target_points)
+    n = len(base_points)
+    return np.sum(np.hypot(r[:n], r[n:]))
+
+def residuals(params, base_points, target_points):
+    """
+    Per-point reprojection residuals, all x residuals followed by all y
+    residuals. Base points are normalised, distorted,
+        x_d = x (1 + k1 r^2 + k2 r^4 + k3 r^6) + 2 p1 x y + p2 (r^2 + 2 x^2)
+        y_d = y (1 + k1 r^2 + k2 r^4 + k3 r^6) + p1 (r^2 + 2 y^2) + 2 p2 x y
+    and projected back with the same intrinsics.
+    """
+    fx, fy, cx, cy, k1, k2, k3, p1, p2 = params
+    x = (base_points[:, 0] - cx) / fx
+    y = (base_points[:, 1] - cy) / fy
+    r2 = x * x + y * y
+    radial = 1.0 + r2 * (k1 + r2 * (k2 + r2 * k3))
+    x_d = x * radial
+    y_d = y * radial
+    if p1 or p2:
+        xy2 = 2.0 * x * y
+        x_d += p1 * xy2 + p2 * (r2 + 2.0 * x * x)
+        y_d += p1 * (r2 + 2.0 * y * y) + p2 * xy2
+    return np.concatenate((cx + fx * x_d - target_points[:, 0],
+                           cy + fy * y_d - target_points[:, 1]))
+
+def jacobian(params, base_points, target_points):
+    """Analytic d(residuals)/d(PARAMETERS), shape (2N, 9)."""
+    fx, fy, cx, cy, k1, k2, k3, p1, p2 = params
+    x = (base_points[:, 0] - cx) / fx
+    y = (base_points[:, 1] - cy) / fy
+    r2 = x * x + y * y
+    r4 = r2 * r2
+    radial = 1.0 + r2 * (k1 + r2 * (k2 + r2 * k3))
+    # d(radial)/d(r^2)
+    d_radial = k1 + r2 * (2.0 * k2 + 3.0 * r2 * k3)
+    xy2 = 2.0 * x * y
+    x_d = x * radial + p1 * xy2 + p2 * (r2 + 2.0 * x * x)
+    y_d = y * radial + p1 * (r2 + 2.0 * y * y) + p2 * xy2
+
+    # Derivatives of (x_d, y_d) with respect to the normalised (x, y).
+    xd_x = radial + 2.0 * x * x * d_radial + 2.0 * p1 * y + 6.0 * p2 * x
+    xd_y = xy2 * d_radial + 2.0 * p1 * x + 2.0 * p2 * y
+    yd_x = xd_y
+    yd_y = radial + 2.0 * y * y * d_radial + 6.0 * p1 * y + 2.0 * p2 * x
+
+    n = len(base_points)
+    J = np.empty((2 * n, 9))
+    # x = (u - cx) / fx: dx/dfx = -x / fx, dx/dcx = -1 / fx (likewise for y).
+    J[:n, 0] = x_d - x * xd_x
+    J[:n, 1] = -fx * y / fy * xd_y
+    J[:n, 2] = 1.0 - xd_x
+    J[:n, 3] = -fx / fy * xd_y
+    J[n:, 0] = -fy * x / fx * yd_x
+    J[n:, 1] = y_d - y * yd_y
+    J[n:, 2] = -fy / fx * yd_x
+    J[n:, 3] = 1.0 - yd_y
+    for i, r_power in ((4, r2), (5, r4), (6, r4 * r2)):
+        J[:n, i] = fx * x * r_power
+        J[n:, i] = fy * y * r_power
+    J[:n, 7] = fx * xy2
+    J[n:, 7] = fy * (r2 + 2.0 * y * y)
+    J[:n, 8] = fx * (r2 + 2.0 * x * x)
+    J[n:, 8] = fy * xy2
+    return J
+
+def parameter_bounds(w, h):
+    """(lower, upper) for each of PARAMETERS, for a w x h image."""
+    return [
+        (0.2 * w, 2.0 * w),   # fx
+        (0.2 * w, 2.0 * w),   # fy
+        (0.25 * w, 0.75 * w), # cx (principal point x)
+        (0.25 * h, 0.75 * h), # cy (principal point y)
+        (-0.5, 0.5),          # k1 (radial distortion)
+        (-1.0, 1.0),          # k2
+        (-1.0, 1.0),          # k3
+        (-0.1, 0.1),          # p1 (tangential distortion)
+        (-0.1, 0.1)           # p2
+    ]
+
+def free_parameters(x0, bounds, locked, square_pixels):
+    """
+    (x0, free mask, lower, upper, full) for solvers that only see the
+    free parameters; full(x_free) expands back to the PARAMETERS vector.
+    """
+    x0 = np.array(x0, dtype=np.float64)
+    free = np.array([not l for l in locked])
+    if square_pixels:
+        x0[FY] = x0[FX]
+
+    def full(x_free):
+        x = x0.copy()
+        x[free] = x_free
+        if square_pixels:
+            x[FY] = x[FX]
+        return x
+
+    lower = np.array([b[0] for b in bounds])[free]
+    upper = np.array([b[1] for b in bounds])[free]
+    return x0, free, lower, upper, full
+
+def fit(base_pts, target_pts, x0, bounds, locked, square_pixels, solver='least_squares', loss='soft_l1',
+        f_scale=2.0, max_iterations=50, callback=None):
+    """
+    Fits the unlocked parameters from x0 and returns the scipy
+    OptimizeResult with the full PARAMETERS vector in x. Used by
+    TuningThread and, for multi-start, directly by the pool workers.
+    callback(x) is called once per iteration.
+    """
+    callback = callback or (lambda x: None)
+    if solver == 'lbfgsb':
+        return _fit_lbfgsb(base_pts, target_pts, x0, bounds, locked, square_pixels, max_iterations, callback)
+    return _fit_least_squares(base_pts, target_pts, x0, bounds, locked, square_pixels, loss, f_scale,
+                              max_iterations, callback)
+
+def _fit_least_squares(base_pts, target_pts, x0, bounds, locked, square_pixels, loss, f_scale, max_iterations,
+                       callback):
+    """
+    Trust-region least squares over the unlocked parameters. Locked ones
+    are held at their defaults and dropped from the problem, since
+    least_squares needs strictly increasing bounds.
+    """
+    x0, free, lower, upper, full = free_parameters(x0, bounds, locked, square_pixels)
+    base_pts = base_pts.astype(np.float64)
+    target_pts = target_pts.astype(np.float64)
+
+    def fun(x_free):
+        return residuals(full(x_free), base_pts, target_pts)
+
+    def jac(x_free):
+        # Evaluated once per accepted step, so it doubles as the progress callback.
+        x = full(x_free)
+        callback(x)
+        J = jacobian(x, base_pts, target_pts)
+        if square_pixels:
+            J[:, FX] += J[:, FY]
+        return J[:, free]
+
+    print(f"Starting least-squares optimization (loss={loss})...")
+    res = least_squares(fun, x0[free], jac=jac, bounds=(lower, upper), method='trf',
+                        loss=loss, f_scale=f_scale, x_scale='jac', max_nfev=max_iterations)
+    res.x = full(res.x)
+    # Running out of evaluations still leaves a usable estimate.
+    res.success = res.status >= 0
+    print(f"least_squares: {res.nfev} evaluations, {res.njev} Jacobians, "
+          f"RMS residual {np.sqrt(np.mean(res.fun ** 2)):.3f} px")
+    return res
+
+def _fit_lbfgsb(base_pts, target_pts, x0, bounds, locked, square_pixels, max_iterations, callback):
+    """Bounded L-BFGS-B fit of the summed point distances (see objective)."""
+    # Locked parameters (and those outside the model) are left out.
+    x0, free, lower, upper, full = free_parameters(x0, bounds, locked, square_pixels)
+
+    print("Starting optimization...")
+    res = minimize(
+        lambda x_free: objective(full(x_free), base_pts, target_pts),
+        x0[free],
+        method='L-BFGS-B',
+        bounds=list(zip(lower, upper)),
+        callback=lambda x_free: callback(full(x_free)),
+        options={'maxiter': max_iterations, 'ftol': 1e-7, 'gtol': 1e-6}
+    )
+    res.x = full(res.x)
+    return res
 
 class TuningThread(QThread):
     """
     Finds distortion parameters by matching features (e.g., AKAZE) between
     a clean base image and a distorted target image, then optimizing
-    the parameters (f, k1, cx, cy) to minimize the reprojection error.
+    the camera intrinsics to minimize the reprojection error. model is a
+    MODELS name or a tuple of PARAMETERS names to fit.
+
+    The default solver is scipy's least_squares on per-point residuals with
+    an analytic Jacobian and a robust loss (f_scale is the inlier scale in
+    pixels); solver='lbfgsb' keeps the original summed-distance fit.
+
+    Images wider or taller than fine_max_side are matched coarse-to-fine on
+    a cv2.pyrDown pyramid: features are matched and fitted on the level
+    that fits in coarse_max_side, then matched again on the level that fits
+    in fine_max_side, searching only near where the coarse fit predicts
+    each base feature, and refitted. Fits always use full-resolution
+    coordinates, so bounds and results do not depend on the level.
+    Setting either size to None always matches at full resolution.
+
+    With starts > 1 the first fit is repeated from starts - 1 more initial
+    guesses spread over the bounds, on a process pool of workers (default
+    min(starts, CPUs); 1 runs them in-process). The lowest-cost solution is
+    kept, and multi_start_stats reports how many starts agreed with it (same
+    cost and parameters) and the spread of all solutions, as a confidence
+    indicator.
     """
     progress_updated = pyqtSignal(int)
     finished = pyqtSignal(dict)
 
-    def __init__(self, base_image_gray, target_image_gray, locks, defaults):
+    def __init__(self, base_image_gray, target_image_gray, locks, defaults,
+                 solver='least_squares', loss='soft_l1', f_scale=2.0, coarse_max_side=1024, fine_max_side=2048,
+                 model='Basic', starts=1, workers=None):
         super().__init__()
         
         self.base_image = base_image_gray
@@ -41,53 +316,189 @@ class TuningThread(QThread):
         self.defaults = defaults
         self.iteration = 0
         self.max_iterations = 50  # Optimizer iterations
+        self.solver = solver
+        self.match_stats = {}
+        self.loss = loss
+        self.f_scale = f_scale
+        self.coarse_max_side = coarse_max_side
+        self.fine_max_side = fine_max_side
+        self.feature_cache = FEATURE_CACHE
+        self.model = tuple(MODELS.get(model, model))
+        self.square_pixels = 'fy' not in self.model
+        self.starts = max(1, int(starts))
+        self.workers = workers or min(self.starts, os.cpu_count() or 1)
+        self.multi_start_stats = {}
 
     def _unflatten_params(self, x_flat):
-        """Convert flat vector [f, k1, cx, cy] -> readable dict."""
-        f, k1, cx, cy = x_flat
-        return {'focal_length': f, 'k1': k1, 'cx': cx, 'cy': cy}
+        """Convert the flat PARAMETERS vector -> readable dict (focal_length is fx)."""
+        params = {name: float(v) for name, v in zip(PARAMETERS, x_flat)}
+        params['focal_length'] = params['fx']
+        return params
+
+    def _is_locked(self, name):
+        return bool(self.locks.get(name)) or any(
+            self.locks.get(group) for group, names in LOCK_GROUPS.items() if name in names)
+
+    @staticmethod
+    def _params_to_level(params, level):
+        """The same camera in the pixel coordinates of pyrDown level 'level'."""
+        params = np.array(params, dtype=np.float64)
+        params[[FX, FY]] /= 2 ** level
+        params[2:4] = to_level(params[2:4], level)
+        return params
+
+    @staticmethod
+    def _ransac_inliers(base_points, target_points, w, h, threshold, iterations=256, seed=0):
+        """
+        RANSAC over a linearised distortion model: an affine map plus one
+        radial term about the image centre,
+            u' = a0 + a1 u + a2 v + k dx r^2,  v' = b0 + b1 u + b2 v + k dy r^2,
+        which is linear in its 7 unknowns, so all hypotheses (4 points each)
+        are solved and scored at once. Returns the inlier mask.
+        """
+        n = len(base_points)
+        scale = max(w, h) / 2.0
+        # Centred, scaled coordinates keep the least-squares systems well conditioned.
+        x = (base_points[:, 0] - w / 2) / scale
+        y = (base_points[:, 1] - h / 2) / scale
+        r2 = x * x + y * y
+        A = np.zeros((2 * n, 7))
+        A[:n, 0], A[:n, 1], A[:n, 2] = 1.0, x, y
+        A[n:, 3], A[n:, 4], A[n:, 5] = 1.0, x, y
+        A[:n, 6], A[n:, 6] = x * r2, y * r2
+        b = np.concatenate(((target_points[:, 0] - w / 2) / scale, (target_points[:, 1] - h / 2) / scale))
+
+        def residuals(models):
+            pred = models @ A.T
+            return np.hypot(pred[..., :n] - b[:n], pred[..., n:] - b[n:]) * scale
+
+        rng = np.random.default_rng(seed)
+        samples = np.array([rng.choice(n, 4, replace=False) for _ in range(iterations)])
+        rows = np.concatenate((samples, samples + n), axis=1)
+        models = np.einsum('mij,mj->mi', np.linalg.pinv(A[rows]), b[rows])
+        counts = (residuals(models) < threshold).sum(axis=1)
+        inliers = residuals(models[np.argmax(counts)]) < threshold
+
+        # Refit on the consensus set, then take its inliers.
+        if inliers.sum() >= 4:
+            both = np.concatenate((inliers, inliers))
+            model = np.linalg.lstsq(A[both], b[both], rcond=None)[0]
+            inliers = residuals(model) < threshold
+        return inliers
+
+    @staticmethod
+    def _project(params, points):
+        """Where the model moves each base point, shape (N, 2)."""
+        r = residuals(params, points, np.zeros_like(points))
+        return r.reshape(2, -1).T
+
+    @staticmethod
+    def _guided_matches(k_base, d_base, k_target, d_target, predicted, radius, ratio):
+        """
+        Matches each base descriptor only against target features within
+        radius of its predicted position (a cKDTree neighbourhood), with the
+        ratio test applied inside the neighbourhood; a lone candidate is
+        accepted. Each target feature keeps only its best match.
+        """
+        target_xy = np.float64([k.pt for k in k_target])
+        neighbours = cKDTree(target_xy).query_ball_point(predicted, r=radius)
+        counts = np.array([len(n) for n in neighbours])
+        if counts.sum() == 0:
+            return []
+        qi = np.repeat(np.arange(len(k_base)), counts)
+        ti = np.concatenate([n for n in neighbours if n]).astype(np.int64)
+        dist = POPCOUNT[np.bitwise_xor(d_base[qi], d_target[ti])].sum(axis=1)
+
+        # Best and second best candidate per base feature.
+        order = np.lexsort((dist, qi))
+        qi, ti, dist = qi[order], ti[order], dist[order]
+        first = np.flatnonzero(np.r_[True, qi[1:] != qi[:-1]])
+        has_second = np.r_[first[1:], len(qi)] - first > 1
+        second = np.where(has_second, dist[np.minimum(first + 1, len(qi) - 1)], np.inf)
+        keep = first[dist[first] < ratio * second]
+
+        # One match per target feature, the closest.
+        keep = keep[np.lexsort((dist[keep], ti[keep]))]
+        keep = keep[np.r_[True, ti[keep][1:] != ti[keep][:-1]]]
+        return [cv2.DMatch(int(qi[i]), int(ti[i]), float(dist[i])) for i in keep]
 
     @staticmethod
-    def _find_and_match_features(img1, img2):
+    def _find_and_match_features(img1, img2, stats=None, ratio=0.8, ransac_threshold=3.0, max_matches=500,
+                                 feature_cache=FEATURE_CACHE, guide=None):
         """
-        Detects and matches AKAZE features between two images.
+        Detects and matches AKAZE features between two images, keeps the
+        matches passing Lowe's ratio test, and returns only the RANSAC
+        inliers (strongest first, at most max_matches). Counts and timings
+        are written into stats if given. The base image's features come
+        from feature_cache (None always detects), since one reference is
+        usually calibrated against many targets.
+
+        guide=(params, radius) replaces brute-force matching with
+        _guided_matches around the positions params predicts (params in
+        these images' pixel coordinates).
         """
+        stats = stats if stats is not None else {}
         try:
             # 1. Initialize AKAZE detector
             # (AKAZE is robust, fast, and license-free)
-            detector = cv2.AKAZE_create()
+            detector = create_detector()
 
             # 2. Find keypoints and descriptors
-            print("Finding features in base image...")
-            k_base, d_base = detector.detectAndCompute(img1, None)
-            print(f"Found {len(k_base)} base features.")
-            
-            print("Finding features in target image (post-resize)...")
-            k_target, d_target = detector.detectAndCompute(img2, None)
-            print(f"Found {len(k_target)} target features.")
+            start = time.perf_counter()
+            with PROFILER.stage('tuning.detect'):
+                if feature_cache is not None:
+                    k_base, d_base = feature_cache.detect(img1)
+                else:
+                    k_base, d_base = detector.detectAndCompute(img1, None)
+                k_target, d_target = detector.detectAndCompute(img2, None)
+            stats['detect_ms'] = (time.perf_counter() - start) * 1000
+            stats['base_features'] = len(k_base)
+            stats['target_features'] = len(k_target)
+            print(f"Found {len(k_base)} base and {len(k_target)} target features.")
 
             if d_base is None or d_target is None:
                 raise Exception("No descriptors found in one or both images.")
 
-            # 3. Match descriptors using Brute-Force Matcher
-            bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
-            matches = bf.match(d_base, d_target)
+            # 3. Two nearest neighbours per descriptor, then Lowe's ratio test
+            start = time.perf_counter()
+            with PROFILER.stage('tuning.match'):
+                if guide is not None:
+                    params, radius = guide
+                    predicted = TuningThread._project(params, np.float64([k.pt for k in k_base]))
+                    matches = TuningThread._guided_matches(k_base, d_base, k_target, d_target, predicted, radius, ratio)
+                else:
+                    bf = cv2.BFMatcher(cv2.NORM_HAMMING)
+                    knn = bf.knnMatch(d_base, d_target, k=2)
+                    matches = [p[0] for p in knn if len(p) == 2 and p[0].distance < ratio * p[1].distance]
+            stats['match_ms'] = (time.perf_counter() - start) * 1000
+            stats['ratio_matches'] = len(matches)
+
+            if len(matches) < 20: # Need a minimum number to optimize
+                 raise Exception(f"Not enough matches passed the ratio test ({len(matches)}).")
+
+            base_points = np.float32([k_base[m.queryIdx].pt for m in matches]).reshape(-1, 2)
+            target_points = np.float32([k_target[m.trainIdx].pt for m in matches]).reshape(-1, 2)
+            distances = np.float32([m.distance for m in matches])
+
+            # 4. Geometric verification
+            start = time.perf_counter()
+            with PROFILER.stage('tuning.ransac'):
+                h, w = img1.shape[:2]
+                inliers = TuningThread._ransac_inliers(base_points, target_points, w, h, ransac_threshold)
+            stats['ransac_ms'] = (time.perf_counter() - start) * 1000
+            stats['inliers'] = int(inliers.sum())
+
+            if stats['inliers'] < 20:
+                raise Exception(f"Not enough inlier matches found ({stats['inliers']}).")
+
+            # 5. Strongest inliers first
+            order = np.argsort(distances[inliers], kind='stable')[:max_matches]
+            base_points = base_points[inliers][order]
+            target_points = target_points[inliers][order]
+            print(f"{len(matches)} matches passed the ratio test, {stats['inliers']} RANSAC inliers; "
+                  f"using {len(base_points)} (detect {stats['detect_ms']:.0f} ms, match {stats['match_ms']:.0f} ms, "
+                  f"RANSAC {stats['ransac_ms']:.0f} ms).")
 
-            # 4. Sort matches by distance (best matches first)
-            matches = sorted(matches, key=lambda x: x.distance)
-            
-            # 5. Keep only the top 100 matches
-            # This filters out noise and speeds up optimization
-            N_MATCHES = 100
-            good_matches = matches[:N_MATCHES]
-            if len(good_matches) < 20: # Need a minimum number to optimize
-                 raise Exception(f"Not enough good matches found ({len(good_matches)}).")
-            print(f"Using top {len(good_matches)} matches.")
-
-            # 6. Extract (x,y) coordinates for the matched points
-            base_points = np.float32([k_base[m.queryIdx].pt for m in good_matches]).reshape(-1, 2)
-            target_points = np.float32([k_target[m.trainIdx].pt for m in good_matches]).reshape(-1, 2)
-            
             return base_points, target_points
 
         except cv2.error as e:
@@ -97,100 +508,175 @@ class TuningThread(QThread):
             print(f"Error during feature matching: {e}")
             return None, None
 
-    @staticmethod
-    def _objective_function(params, base_points, target_points):
+    def _initial_guess_and_bounds(self, x0=None):
         """
-        The error function for the optimizer.
-        It calculates the distance between where the target points *should*
-        be (given the 'params') and where they *actually* are.
+        Full PARAMETERS vector to start from (the defaults, or an earlier
+        coarser fit), per-parameter bounds, and which parameters are held
+        fixed: those the model leaves out and those locked.
         """
-        fx, k1, cx, cy = params
-        fy = fx  # Assume square pixels
+        h, w = self.base_image.shape
 
-        # 1. Normalize base points (pixel coords -> normalized coords)
-        # x_n = (u - cx) / fx
-        x_n = (base_points[:, 0] - cx) / fx
-        y_n = (base_points[:, 1] - cy) / fy
+        # Initial guess from the defaults, or from an earlier (coarser) fit
+        if x0 is None:
+            f = self.defaults.get('focal_length', w * 0.8)
+            guess = {'fx': f, 'fy': f, 'cx': w / 2, 'cy': h / 2}
+            guess.update({name: self.defaults[name] for name in PARAMETERS if name in self.defaults})
+            initial_guess = np.array([guess.get(name, 0.0) for name in PARAMETERS], dtype=np.float64)
+        else:
+            initial_guess = np.array(x0, dtype=np.float64)
 
-        # 2. Apply radial distortion (k1 only)
-        # r^2 = x_n^2 + y_n^2
-        r2 = x_n * x_n + y_n * y_n
-        radial = 1.0 + k1 * r2
-        
-        # x_d = x_n * (1 + k1*r^2)
-        x_d = x_n * radial
-        y_d = y_n * radial
-
-        # 3. Un-normalize (normalized coords -> projected pixel coords)
-        # u_proj = x_d * fx + cx
-        u_proj = x_d * fx + cx
-        v_proj = y_d * fy + cy
-
-        # 4. Create the array of projected points
-        projected_points = np.stack((u_proj, v_proj), axis=1)
-
-        # 5. Calculate the error (L2 norm)
-        # This is the sum of distances between each projected point
-        # and its corresponding actual target point.
-        error = np.sum(np.linalg.norm(projected_points - target_points, axis=1))
-        
-        return error
+        locked = [name not in self.model or self._is_locked(name) for name in PARAMETERS]
+        return initial_guess, parameter_bounds(w, h), locked
 
-    def run(self):
-        try:
-            # ---------- 1. Find Features ----------
-            # self.base_image and self.target_image are now guaranteed to be the same size
-            base_pts, target_pts = self._find_and_match_features(self.base_image, self.target_image)
-            
+    def _free_parameters(self, x0=None):
+        x0, bounds, locked = self._initial_guess_and_bounds(x0)
+        return free_parameters(x0, bounds, locked, self.square_pixels)
+
+    def _optimize(self, base_pts, target_pts, x0=None, f_scale=None):
+        """
+        Fits the model's parameters on matched points with the configured solver and
+        returns the scipy OptimizeResult. x0 overrides the defaults as the
+        starting point (and skips multi-start) and f_scale the robust loss scale.
+        """
+        if self.starts > 1 and x0 is None:
+            return self._optimize_multi_start(base_pts, target_pts, f_scale)
+        return self._optimize_single(base_pts, target_pts, x0, f_scale)
+
+    def _start_points(self, count, seed=0):
+        """
+        The default initial guess plus count - 1 more, Latin-hypercube
+        sampled over the free parameters' bounds: each start takes a
+        different slice of every parameter's range.
+        """
+        x0, free, lower, upper, full = self._free_parameters()
+        if count <= 1 or not free.any():
+            return [x0]
+        rng = np.random.default_rng(seed)
+        n = count - 1
+        strata = np.stack([rng.permutation(n) for _ in range(free.sum())], axis=1)
+        unit = (strata + rng.random(strata.shape)) / n
+        return [x0] + [full(lower + u * (upper - lower)) for u in unit]
+
+    def _optimize_multi_start(self, base_pts, target_pts, f_scale=None):
+        _, bounds, locked = self._initial_guess_and_bounds()
+        jobs = [(base_pts, target_pts, x, bounds, locked, self.square_pixels, self.solver, self.loss,
+                 f_scale or self.f_scale, self.max_iterations) for x in self._start_points(self.starts)]
+        print(f"Multi-start: {len(jobs)} fits on {self.workers} worker(s)...")
+
+        if self.workers > 1:
+            executor = _get_executor(self.workers)
+            pending = [executor.submit(fit, *job) for job in jobs]
+            outcomes = (future.result() for future in pending)
+        else:
+            outcomes = (fit(*job) for job in jobs)
+        results = []
+        for res in outcomes:
+            results.append(res)
+            self.progress_updated.emit(min(10 + int(len(results) / len(jobs) * 90), 99))
+
+        converged = [r for r in results if r.success]
+        if not converged:
+            return results[0]
+        costs = np.array([r.cost if 'cost' in r else r.fun for r in converged])
+        solutions = np.array([r.x for r in converged])
+        same_cost = costs <= costs.min() * (1 + AGREEMENT_TOLERANCE) + 1e-12
+        # Ties go to the default start, so a single-start optimum is kept as is.
+        best = results[0] if results[0].success and same_cost[0] else converged[int(np.argmin(costs))]
+
+        free = ~np.array(locked)
+        width = np.array([b[1] - b[0] for b in bounds])[free]
+        distance = np.abs(solutions[:, free] - best.x[free]) / width
+        agreeing = same_cost & np.all(distance <= PARAMETER_TOLERANCE, axis=1)
+        # Spread over all converged starts: large for a parameter the matches
+        # do not pin down (e.g. fx, where the Basic model only fits k1 / fx^2)
+        # or when starts end in different minima.
+        self.multi_start_stats = {
+            'starts': len(results),
+            'converged': len(converged),
+            'agreeing': int(agreeing.sum()),
+            'spread': {name: float(std) for name, std in zip(PARAMETERS, solutions.std(axis=0))
+                       if name in self.model and not self._is_locked(name)}
+        }
+        spread = ", ".join(f"{name} +/-{std:.4g}" for name, std in self.multi_start_stats['spread'].items())
+        print(f"Multi-start: {int(same_cost.sum())}/{len(results)} starts reached the best cost {costs.min():.4g}, "
+              f"{self.multi_start_stats['agreeing']} of them at the same parameters; spread {spread}.")
+        return best
+
+    def _optimize_single(self, base_pts, target_pts, x0=None, f_scale=None):
+        x0, bounds, locked = self._initial_guess_and_bounds(x0)
+        self.iteration = 0 # Reset iteration count for callback
+        return fit(base_pts, target_pts, x0, bounds, locked, self.square_pixels, self.solver, self.loss,
+                   f_scale or self.f_scale, self.max_iterations, self.callback)
+
+    def _pyramid_levels(self):
+        """(coarse, fine) pyrDown levels for coarse-to-fine matching, or None to match at full resolution."""
+        side = max(self.base_image.shape)
+        if not self.coarse_max_side or not self.fine_max_side or side <= self.fine_max_side:
+            return None
+
+        def level(max_side):
+            l = 0
+            while side / 2 ** l > max_side:
+                l += 1
+            return l
+
+        fine = level(self.fine_max_side)
+        return max(level(self.coarse_max_side), fine), fine
+
+    def _match_and_optimize(self):
+        """
+        Matches features (coarse-to-fine for large images) and fits the
+        parameters. Returns (OptimizeResult, base_pts, target_pts) with points
+        in full-resolution pixels; raises if matching or the coarse fit fails.
+        """
+        if self.starts > 1 and self.workers > 1:
+            warm_up_pool(self.workers)
+        levels = self._pyramid_levels()
+        if levels is None:
+            base_pts, target_pts = self._find_and_match_features(self.base_image, self.target_image, self.match_stats,
+                                                                 feature_cache=self.feature_cache)
             if base_pts is None:
                 # Error already printed in the function
                 raise Exception("Feature matching failed.")
-            
             self.progress_updated.emit(10) # 10% for feature matching
+            return self._optimize(base_pts, target_pts), base_pts, target_pts
 
-            # ---------- 2. Set up Optimization ----------
-            h, w = self.base_image.shape
-            
-            # Initial guess from the defaults
-            initial_guess = np.array([
-                self.defaults['focal_length'],
-                self.defaults['k1'],
-                self.defaults['cx'],
-                self.defaults['cy']
-            ])
-            
-            # Parameter bounds
-            bounds = [
-                (0.2 * w, 2.0 * w),  # focal length (fx)
-                (-0.5, 0.5),         # k1 (radial distortion)
-                (0.25 * w, 0.75 * w),# cx (principal point x)
-                (0.25 * h, 0.75 * h) # cy (principal point y)
-            ]
-            
-            # Apply locks from UI
-            if self.locks.get('focal_length'):
-                f_lock = self.defaults['focal_length']
-                bounds[0] = (f_lock, f_lock)
-                initial_guess[0] = f_lock
-                
-            if self.locks.get('distortion'):
-                k1_lock = self.defaults['k1']
-                bounds[1] = (k1_lock, k1_lock)
-                initial_guess[1] = k1_lock
-
-            print("Starting optimization...")
-            self.iteration = 0 # Reset iteration count for callback
-            
-            # ---------- 3. Run Optimizer ----------
-            res = minimize(
-                self._objective_function,
-                initial_guess,
-                args=(base_pts, target_pts),
-                method='L-BFGS-B',
-                bounds=bounds,
-                callback=self.callback,
-                options={'maxiter': self.max_iterations, 'ftol': 1e-7, 'gtol': 1e-6}
-            )
+        coarse, fine = levels
+        with PROFILER.stage('tuning.pyramid'):
+            pyramid = [(self.base_image, self.target_image)]
+            for _ in range(coarse):
+                base, target = pyramid[-1]
+                pyramid.append((cv2.pyrDown(base), cv2.pyrDown(target)))
+        self.match_stats['pyramid_levels'] = (coarse, fine)
+        print(f"Coarse-to-fine matching: level {coarse} ({pyramid[coarse][0].shape[1]} px wide), "
+              f"then level {fine} ({pyramid[fine][0].shape[1]} px wide).")
+
+        # Coarse: brute-force matching and a first fit.
+        base_pts, target_pts = self._find_and_match_features(*pyramid[coarse], self.match_stats,
+                                                             feature_cache=self.feature_cache)
+        if base_pts is None:
+            raise Exception("Feature matching failed on the coarse level.")
+        self.match_stats['coarse_inliers'] = self.match_stats['inliers']
+        self.progress_updated.emit(10)
+        res = self._optimize(from_level(base_pts, coarse), from_level(target_pts, coarse),
+                             f_scale=self.f_scale * 2 ** coarse)
+        if not res.success:
+            raise Exception("Coarse optimization failed to converge.")
+
+        # Fine: match only near the coarse fit's predictions, then refit from it.
+        guide = (self._params_to_level(res.x, fine), GUIDE_RADIUS)
+        base_pts, target_pts = self._find_and_match_features(*pyramid[fine], self.match_stats,
+                                                             feature_cache=self.feature_cache, guide=guide)
+        if base_pts is None:
+            raise Exception("Feature matching failed on the fine level.")
+        base_pts, target_pts = from_level(base_pts, fine), from_level(target_pts, fine)
+        return self._optimize(base_pts, target_pts, x0=res.x, f_scale=self.f_scale * 2 ** fine), base_pts, target_pts
+
+    def run(self):
+        try:
+            # ---------- 1. Find Features, 2./3. Set up and Run Optimizer ----------
+            # self.base_image and self.target_image are now guaranteed to be the same size
+            res, _, _ = self._match_and_optimize()
 
             if res.success:
                 print("Optimization successful.")
@@ -209,7 +695,7 @@ class TuningThread(QThread):
     def callback(self, xk):
         """
         Callback function for the optimizer to update progress.
-        'xk' is the current parameter vector [f, k1, cx, cy].
+        'xk' is the current PARAMETERS vector.
         """
         self.iteration += 1
         
@@ -217,5 +703,7 @@ class TuningThread(QThread):
         prog = 10 + int((self.iteration / self.max_iterations) * 90)
         self.progress_updated.emit(min(prog, 99)) # Cap at 99% until finished
         
-        f, k1, cx, cy = xk
-        print(f"Iter {self.iteration:02d} | f {f:6.1f} | k1 {k1:+.4f} | cx,cy ({cx:.1f}, {cy:.1f})")
\ No newline at end of file
+        fx, fy, cx, cy = xk[:4]
+        f = f"{fx:6.1f}" if self.square_pixels else f"{fx:6.1f}/{fy:6.1f}"
+        coefficients = " | ".join(f"{name} {xk[i]:+.4f}" for i, name in enumerate(PARAMETERS) if i >= 4 and name in self.model)
+        print(f"Iter {self.iteration:02d} | f {f} | {coefficients} | cx,cy ({cx:.1f}, {cy:.1f})")
\ No newline at end of file